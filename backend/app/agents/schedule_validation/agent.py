@@ -31,8 +31,8 @@ from .validators.curfew_validator import CurfewValidator
 from .validators.regulatory_validator import RegulatoryValidator
 from .validators.routing_validator import RoutingValidator
 from .validators.pattern_validator import PatternValidator
-from .analyzers.conflict_analyzer import ConflictAnalyzer
-from .reports.report_generator import ReportGenerator
+from .conflict_analyzer import ConflictAnalyzer
+from .report_generator import ReportGenerator
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -145,6 +145,29 @@ class ScheduleValidationAgent:
 
         logger.info(f"ScheduleValidationAgent initialized with model: {llm_model}")
 
+    def use_connection(self, db_connection):
+        """
+        Bind the agent and its validators to another database connection
+
+        Lets one agent (and its compiled graph) serve a succession of
+        pooled connections.
+
+        Args:
+            db_connection: PostgreSQL database connection, or None to unbind
+        """
+        self.db = db_connection
+        for validator in (
+            self.slot_validator,
+            self.aircraft_validator,
+            self.crew_validator,
+            self.mct_validator,
+            self.curfew_validator,
+            self.regulatory_validator,
+            self.routing_validator,
+            self.pattern_validator
+        ):
+            validator.db = db_connection
+
     def _build_graph(self) -> StateGraph:
         """
         Build LangGraph workflow with parallel validation nodes
@@ -205,7 +228,8 @@ class ScheduleValidationAgent:
     def validate(
         self,
         schedule_id: str,
-        flight_ids: Optional[List[str]] = None
+        flight_ids: Optional[List[str]] = None,
+        options: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Validate schedule or specific flights
@@ -213,10 +237,16 @@ class ScheduleValidationAgent:
         Args:
             schedule_id: Schedule UUID to validate
             flight_ids: Optional list of specific flight IDs to validate
+            options: Validation options
+                - fail_fast: Stop once critical_threshold critical issues
+                  are found (skips remaining categories and LLM analysis)
+                - critical_threshold: Critical issues that stop a
+                  fail_fast run (default 1)
 
         Returns:
             Validation results with issues and recommendations
         """
+        options = options or {}
         start_time = datetime.now()
 
         # Initialize state
@@ -239,7 +269,13 @@ class ScheduleValidationAgent:
         try:
             # Execute workflow
             logger.info(f"Starting validation for schedule: {schedule_id}")
-            final_state = self.graph.invoke(initial_state)
+            if options.get("fail_fast"):
+                final_state = self._validate_fail_fast(
+                    initial_state,
+                    options.get("critical_threshold", 1)
+                )
+            else:
+                final_state = self.graph.invoke(initial_state)
 
             # Calculate duration
             end_time = datetime.now()
@@ -503,6 +539,61 @@ class ScheduleValidationAgent:
     # HELPER METHODS
     # =========================================================================
 
+    def _validate_fail_fast(
+        self,
+        state: ValidationState,
+        critical_threshold: int
+    ) -> ValidationState:
+        """
+        Run the validation categories one at a time, stopping early
+
+        Used when the caller only needs to know whether the schedule has
+        critical issues. The categories share one database connection, so
+        the parallel graph gains little over running them in sequence;
+        in sequence the remaining categories and the LLM analysis can be
+        skipped as soon as critical_threshold critical issues are found.
+        """
+        categories = [
+            ("slot_validation", self.validate_airport_slots),
+            ("aircraft_validation", self.validate_aircraft_availability),
+            ("crew_validation", self.validate_crew_feasibility),
+            ("mct_validation", self.validate_minimum_connect_times),
+            ("curfew_validation", self.validate_airport_hours),
+            ("regulatory_validation", self.validate_regulatory_compliance),
+            ("routing_validation", self.validate_aircraft_routing),
+            ("pattern_validation", self.validate_schedule_patterns)
+        ]
+
+        state = self.load_schedule_data(state)
+
+        critical_count = 0
+        skipped = []
+
+        for i, (category, validate_category) in enumerate(categories):
+            state = validate_category(state)
+
+            critical_count += sum(
+                1 for issue in state["validation_results"][category]
+                if issue["severity"] == IssueSeverity.CRITICAL.value
+            )
+
+            if critical_count >= critical_threshold:
+                skipped = [name for name, _ in categories[i + 1:]]
+                break
+
+        state = self.compile_validation_results(state)
+
+        if skipped:
+            logger.info(
+                f"Fail-fast: {critical_count} critical issues, "
+                f"skipped {len(skipped)} categories"
+            )
+            state["validation_summary"]["skipped_categories"] = skipped
+            return state
+
+        state = self.analyze_conflicts_with_llm(state)
+        return self.generate_validation_report(state)
+
     def _format_result(self, state: ValidationState) -> Dict[str, Any]:
         """Format final result for API response"""
         return {
@@ -4,9 +4,9 @@ Uses LLM to analyze validation issues and suggest resolutions
 """
 
 from typing import List, Dict, Any
+import orjson
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
-import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -155,8 +155,8 @@ Format as JSON with keys: root_causes, business_impact, resolution_priority, rec
 
             # Try to parse as JSON
             try:
-                analysis = json.loads(response.content)
-            except json.JSONDecodeError:
+                analysis = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
                 # If not JSON, return as text
                 analysis = {
                     "analysis_text": response.content,
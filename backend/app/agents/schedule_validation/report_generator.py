@@ -4,6 +4,7 @@ Generates formatted validation reports
 """
 
 from typing import List, Dict, Any
+from collections import Counter
 from datetime import datetime
 import json
 import logging
@@ -50,6 +51,7 @@ class ReportGenerator:
 
     def _generate_json_report(self, state: Dict[str, Any]) -> str:
         """Generate JSON report"""
+        severities = Counter(i.get("severity") for i in state.get("all_issues", []))
         report = {
             "schedule_id": state.get("schedule_id"),
             "validation_timestamp": datetime.utcnow().isoformat(),
@@ -57,10 +59,10 @@ class ReportGenerator:
             "statistics": {
                 "total_flights": state.get("total_flights", 0),
                 "total_issues": len(state.get("all_issues", [])),
-                "critical_issues": len([i for i in state.get("all_issues", []) if i.get("severity") == "critical"]),
-                "high_issues": len([i for i in state.get("all_issues", []) if i.get("severity") == "high"]),
-                "medium_issues": len([i for i in state.get("all_issues", []) if i.get("severity") == "medium"]),
-                "low_issues": len([i for i in state.get("all_issues", []) if i.get("severity") == "low"])
+                "critical_issues": severities["critical"],
+                "high_issues": severities["high"],
+                "medium_issues": severities["medium"],
+                "low_issues": severities["low"]
             },
             "validation_results": {
                 "slot_validation": {
@@ -250,10 +252,11 @@ class ReportGenerator:
         issues = state.get("all_issues", [])
         analysis = state.get("analysis_result", {})
 
-        critical = len([i for i in issues if i.get("severity") == "critical"])
-        high = len([i for i in issues if i.get("severity") == "high"])
-        medium = len([i for i in issues if i.get("severity") == "medium"])
-        low = len([i for i in issues if i.get("severity") == "low"])
+        severities = Counter(i.get("severity") for i in issues)
+        critical = severities["critical"]
+        high = severities["high"]
+        medium = severities["medium"]
+        low = severities["low"]
 
         html = f"""<!DOCTYPE html>
 <html>
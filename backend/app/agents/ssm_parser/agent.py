@@ -4,28 +4,75 @@ Intelligent agent for ingesting, parsing, validating, and transforming
 IATA SSM/SSIM messages into structured database records.
 """
 
-import json
+import re
 import uuid
+import hashlib
+import os
 import logging
+import sqlite3
+import threading
+import time
 from datetime import datetime, date
-from typing import TypedDict, List, Optional, Dict, Any, Literal
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import TypedDict, Iterable, List, Optional, Dict, Any, Literal
 from enum import Enum
 
+from cachetools import TTLCache
 from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.sqlite import SqliteSaver
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel, Field
 
 from .parsers.ssm_parser import SSMParser
 from .parsers.ssim_parser import SSIMParser
 from .validators.message_validator import MessageValidator
 from .transformers.record_transformer import RecordTransformer
-from .database.db_writer import DatabaseWriter
+from .database.db_writer import DatabaseWriter, STREAM_CHUNK_SIZE
 from .database.neo4j_writer import Neo4jWriter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Node result cache for replayed messages (retries, dedup windows)
+NODE_CACHE_TTL_SECONDS = 300
+NODE_CACHE_MAX_ENTRIES = 4096
+
+# Batches at least this large are pre-parsed in a process pool
+PARALLEL_PARSE_THRESHOLD = 200
+
+# Messages pre-parsed ahead of the graph at a time (bounds memory held)
+PARALLEL_PARSE_WINDOW = 4096
+
+# Stateless parsers shared by all agents and by parse worker processes
+_SSM_PARSER = SSMParser()
+_SSIM_PARSER = SSIMParser()
+
+# Stateless transformer shared by all agents
+_TRANSFORMER = RecordTransformer()
+
+
+def _message_key(raw_message: str) -> bytes:
+    """Content hash of a raw message, used as the node cache key"""
+    return hashlib.blake2b(raw_message.encode(), digest_size=16).digest()
+
+
+def _elapsed_ms(start_ns: int) -> int:
+    """Milliseconds since a perf_counter_ns() reading (monotonic clock)"""
+    return (time.perf_counter_ns() - start_ns) // 1_000_000
+
+
+@lru_cache(maxsize=4)
+def _llm(model: str) -> ChatAnthropic:
+    """Shared Claude client per model, so agents reuse one HTTP connection pool"""
+    return ChatAnthropic(
+        model=model,
+        temperature=0,
+        max_tokens=4096
+    )
+
 
 class MessageType(str, Enum):
     """IATA SSM Message Types"""
@@ -41,6 +88,43 @@ class MessageType(str, Enum):
     ADM = "ADM"  # Administrative
 
 
+# Three-letter verbs that open an SSM message
+_SSM_PREFIXES = frozenset(t.value for t in MessageType)
+
+# SSM date token (e.g. 1DEC24, 15JAN25)
+_DATE_RE = re.compile(r"\d{1,2}[A-Z]{3}\d{2}")
+
+
+def _looks_like_ssm(raw_message: str) -> bool:
+    """Cheap structural check that a message is worth an LLM parse attempt"""
+    return (
+        raw_message[:3] in _SSM_PREFIXES
+        and len(raw_message.split(None, 5)) >= 5
+        and _DATE_RE.search(raw_message[:120]) is not None
+    )
+
+
+def _parse_in_worker(raw_message: str) -> Optional[tuple]:
+    """
+    Regex-parse one message in a worker process ahead of the graph
+
+    Mirrors detect_message_format and the parse nodes. Returns
+    (node, parsed_data), or None when the graph has to handle the message
+    itself (unknown format, parse errors, LLM fallback).
+    """
+    try:
+        if raw_message[:3] in _SSM_PREFIXES:
+            message_type = raw_message.split(None, 1)[0].upper()
+            return "parse_ssm", _SSM_PARSER.parse(raw_message, message_type)
+        if raw_message[:2] in ("3 ", "4 "):
+            return "parse_ssim", _SSIM_PARSER.parse(raw_message)
+    except Exception:
+        # Parse errors are reported by the graph when it re-runs the node
+        pass
+
+    return None
+
+
 class MessageFormat(str, Enum):
     """Message format types"""
     SSM = "SSM"
@@ -58,6 +142,32 @@ class ProcessingStatus(str, Enum):
     REJECTED = "rejected"
 
 
+class ParsedSSM(BaseModel):
+    """Structured output schema for LLM-assisted parsing (parser field names)"""
+    message_type: str = Field(..., description="NEW, TIM, EQT, CNL, CON, SKD, RPL or SSIM")
+    airline: str = Field(..., description="2-3 char carrier code")
+    flight_number: Optional[str] = Field(None, description="Absent for SKD")
+    service_type: Optional[str] = Field(None, description="J, F, C or H")
+    origin: Optional[str] = Field(None, description="IATA airport code")
+    destination: Optional[str] = Field(None, description="IATA airport code")
+    operating_days: Optional[str] = Field(None, description="7 chars, e.g. 1234567 or X2X4X6X")
+    effective_from: Optional[str] = Field(None, description="DDMMMYY, e.g. 1DEC24")
+    effective_to: Optional[str] = Field(None, description="DDMMMYY")
+    aircraft_type: Optional[str] = Field(None, description="3 char IATA equipment code")
+    departure_time: Optional[str] = Field(None, description="HHMM")
+    arrival_time: Optional[str] = Field(None, description="HHMM")
+    day_change: Optional[str] = Field(None, description="E0, E+1, E-1")
+    meal_service: Optional[str] = None
+    confidence: float = Field(..., ge=0, le=1)
+    ambiguities: List[str] = Field(default_factory=list)
+
+
+# Compact prompt: the schema carries the field list, one example shows the format
+LLM_PARSE_PROMPT = """Parse IATA SSM/SSIM schedule messages into the given schema.
+Example: NEW CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 738 0715 0945 0230 E0 M JP
+Set confidence (0-1) and list any ambiguities."""
+
+
 class SSMParserState(TypedDict):
     """State for SSM parsing workflow"""
     # Input
@@ -71,6 +181,7 @@ class SSMParserState(TypedDict):
     message_format: Optional[str]
 
     # Parsing
+    primed_parse: Optional[tuple]  # (node, parsed_data) pre-parsed by process_batch
     parsed_data: Optional[Dict[str, Any]]
     parsing_method: Optional[str]  # 'regex', 'llm', 'hybrid'
 
@@ -84,12 +195,14 @@ class SSMParserState(TypedDict):
     affected_flight_ids: List[str]
 
     # Persistence
+    duplicate_status: Optional[str]  # 'new', 'duplicate', 'update'
     ssm_record_id: Optional[str]
     neo4j_updated: bool
 
     # Status
     processing_status: str
     error_message: Optional[str]
+    acknowledgment: Optional[str]
 
     # Metadata
     processed_at: Optional[datetime]
@@ -98,6 +211,27 @@ class SSMParserState(TypedDict):
     confidence_score: Optional[float]
 
 
+# Scalar defaults shared by every message; list fields are filled per message
+_INITIAL_STATE: Dict[str, Any] = {
+    "message_type": None,
+    "message_format": None,
+    "primed_parse": None,
+    "parsed_data": None,
+    "parsing_method": None,
+    "is_valid": False,
+    "duplicate_status": None,
+    "ssm_record_id": None,
+    "neo4j_updated": False,
+    "processing_status": ProcessingStatus.PROCESSING.value,
+    "error_message": None,
+    "acknowledgment": None,
+    "processed_at": None,
+    "processing_time_ms": None,
+    "llm_tokens_used": 0,
+    "confidence_score": None
+}
+
+
 class SSMParserAgent:
     """
     SSM Parser Agent - Intelligent IATA SSM/SSIM message processor
@@ -112,41 +246,70 @@ class SSMParserAgent:
     - Duplicate detection and idempotency
     """
 
+    # Parsers and the transformer hold no per-instance state, so one set is
+    # shared by all agents
+    ssm_parser = _SSM_PARSER
+    ssim_parser = _SSIM_PARSER
+    transformer = _TRANSFORMER
+
     def __init__(
         self,
         db_connection,
         neo4j_driver,
         llm_model: str = "claude-sonnet-4-20250514",
-        use_llm_fallback: bool = True
+        use_llm_fallback: bool = True,
+        checkpoint_db: Optional[str] = None,
+        db_pool=None,
+        validator: Optional[MessageValidator] = None
     ):
         """
         Initialize SSM Parser Agent
 
         Args:
-            db_connection: PostgreSQL database connection
+            db_connection: PostgreSQL database connection; may be None
+                when db_pool is given
             neo4j_driver: Neo4j driver instance
             llm_model: Claude model for LLM-assisted parsing
             use_llm_fallback: Enable LLM fallback for complex messages
+            checkpoint_db: SQLite path for run checkpoints; when set, a message
+                that already completed is answered from its checkpoint
+            db_pool: Optional ThreadedConnectionPool; when given, every
+                read and save checks out its own connection, so one agent
+                can serve concurrent requests
+            validator: Optional shared MessageValidator; by default one is
+                built on the same connection or pool, which loads reference codes
         """
         self.db = db_connection
+        self.db_pool = db_pool
         self.neo4j_driver = neo4j_driver
         self.use_llm_fallback = use_llm_fallback
 
-        # Initialize LLM
-        self.llm = ChatAnthropic(
-            model=llm_model,
-            temperature=0,
-            max_tokens=4096
-        )
+        # Initialize LLM (shared across agents using the same model)
+        self.llm = _llm(llm_model)
 
         # Initialize components
-        self.ssm_parser = SSMParser()
-        self.ssim_parser = SSIMParser()
-        self.validator = MessageValidator(db_connection)
-        self.transformer = RecordTransformer()
-        self.db_writer = DatabaseWriter(db_connection)
+        self.validator = validator or MessageValidator(
+            db_connection, connection_pool=db_pool
+        )
+        self.db_writer = DatabaseWriter(db_connection, connection_pool=db_pool)
         self.neo4j_writer = Neo4jWriter(neo4j_driver)
 
+        # Cache for deterministic nodes (parse, validate), keyed by message hash.
+        # Side-effectful nodes (save, Neo4j) and the transformer (generates
+        # fresh flight UUIDs) are never cached.
+        self.node_cache = TTLCache(
+            maxsize=NODE_CACHE_MAX_ENTRIES,
+            ttl=NODE_CACHE_TTL_SECONDS
+        )
+        # TTLCache is not thread-safe; a pooled agent runs concurrent messages
+        self._node_cache_lock = threading.Lock()
+
+        # Checkpoints keyed by message content hash make re-ingest idempotent
+        self.checkpointer = (
+            SqliteSaver(sqlite3.connect(checkpoint_db, check_same_thread=False))
+            if checkpoint_db else None
+        )
+
         # Build LangGraph workflow
         self.graph = self._build_graph()
 
@@ -160,9 +323,10 @@ class SSMParserAgent:
         1. Detect message format (SSM vs SSIM)
         2. Parse message (regex-based or LLM-assisted)
         3. Validate parsed data
-        4. Transform to database records
-        5. Save to PostgreSQL
-        6. Update Neo4j knowledge graph
+        4. Check for duplicates (duplicates end here)
+        5. Transform to database records
+        6. Save to PostgreSQL
+        7. Update Neo4j knowledge graph
         """
         workflow = StateGraph(SSMParserState)
 
@@ -203,22 +367,29 @@ class SSMParserAgent:
             "validate_parsed_data",
             self.check_validation,
             {
-                "valid": "transform_to_records",
+                "valid": "check_duplicates",
                 "invalid": "handle_errors"
             }
         )
 
-        # After transformation, check duplicates
-        workflow.add_edge("transform_to_records", "check_duplicates")
-
-        # Route based on duplicate check
+        # Check duplicates before transforming, so duplicates skip the work
         workflow.add_conditional_edges(
             "check_duplicates",
             self.route_after_duplicate_check,
             {
-                "new": "save_to_database",
-                "duplicate": "handle_errors",
-                "update": "save_to_database"
+                "new": "transform_to_records",
+                "duplicate": END,
+                "update": "transform_to_records"
+            }
+        )
+
+        # Only save records that transformed cleanly
+        workflow.add_conditional_edges(
+            "transform_to_records",
+            self.check_validation,
+            {
+                "valid": "save_to_database",
+                "invalid": "handle_errors"
             }
         )
 
@@ -232,7 +403,7 @@ class SSMParserAgent:
         workflow.add_edge("generate_acknowledgment", END)
         workflow.add_edge("handle_errors", END)
 
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
 
     def process(self, raw_message: str, **kwargs) -> Dict[str, Any]:
         """
@@ -245,48 +416,51 @@ class SSMParserAgent:
         Returns:
             Processing result with status and details
         """
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
+        raw_message = raw_message.strip()
+
+        # Replay completed runs of the same message from the checkpointer
+        config = None
+        if self.checkpointer is not None:
+            config = {"configurable": {"thread_id": _message_key(raw_message).hex()}}
+            completed_state = self._completed_run(config)
+            if completed_state is not None:
+                completed_state["processing_time_ms"] = _elapsed_ms(start_ns)
+                completed_state["processed_at"] = datetime.now()
+                logger.info(
+                    f"Message {completed_state['message_id']} already processed, "
+                    f"returning checkpoint"
+                )
+                return self._format_result(completed_state)
 
         # Initialize state
         initial_state: SSMParserState = {
-            "raw_message": raw_message.strip(),
+            **_INITIAL_STATE,
+            "raw_message": raw_message,
             "message_id": str(uuid.uuid4()),
             "sender_airline": kwargs.get("sender_airline"),
             "receiver_airline": kwargs.get("receiver_airline"),
-            "message_type": None,
-            "message_format": None,
-            "parsed_data": None,
-            "parsing_method": None,
+            "primed_parse": kwargs.get("primed_parse"),
             "validation_errors": [],
             "validation_warnings": [],
-            "is_valid": False,
             "database_records": [],
-            "affected_flight_ids": [],
-            "ssm_record_id": None,
-            "neo4j_updated": False,
-            "processing_status": ProcessingStatus.PROCESSING.value,
-            "error_message": None,
-            "processed_at": None,
-            "processing_time_ms": None,
-            "llm_tokens_used": 0,
-            "confidence_score": None
+            "affected_flight_ids": []
         }
 
         try:
             # Execute workflow
             logger.info(f"Processing SSM message: {initial_state['message_id']}")
-            final_state = self.graph.invoke(initial_state)
+            final_state = self.graph.invoke(initial_state, config)
 
             # Calculate processing time
-            end_time = datetime.now()
-            processing_time = (end_time - start_time).total_seconds() * 1000
-            final_state["processing_time_ms"] = int(processing_time)
-            final_state["processed_at"] = end_time
+            processing_time = _elapsed_ms(start_ns)
+            final_state["processing_time_ms"] = processing_time
+            final_state["processed_at"] = datetime.now()
 
             logger.info(
                 f"Message {final_state['message_id']} processed: "
                 f"status={final_state['processing_status']}, "
-                f"time={processing_time:.0f}ms"
+                f"time={processing_time}ms"
             )
 
             return self._format_result(final_state)
@@ -297,26 +471,71 @@ class SSMParserAgent:
                 "message_id": initial_state["message_id"],
                 "status": ProcessingStatus.FAILED.value,
                 "error": str(e),
-                "processing_time_ms": int((datetime.now() - start_time).total_seconds() * 1000)
+                "processing_time_ms": _elapsed_ms(start_ns)
             }
 
+    def process_by_id(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Reprocess a stored SSM/SSIM message
+
+        Args:
+            message_id: ssm_messages ID of the message to reprocess
+
+        Returns:
+            Processing result as returned by process(), or None if no
+            such message is stored
+        """
+        conn = self.db_pool.getconn() if self.db_pool is not None else self.db
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "SELECT raw_message, sender_airline FROM ssm_messages WHERE message_id = %s",
+                    (message_id,)
+                )
+                row = cursor.fetchone()
+            finally:
+                cursor.close()
+        finally:
+            if self.db_pool is not None:
+                self.db_pool.putconn(conn)
+
+        if row is None:
+            return None
+
+        raw_message, sender_airline = row
+        return self.process(raw_message, sender_airline=sender_airline)
+
     def process_batch(
         self,
         messages: List[str],
-        batch_size: int = 100
+        batch_size: int = 100,
+        max_workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Process multiple SSM messages in batches
 
+        Large batches are regex-parsed across a process pool first, one
+        window at a time. Each message's parse is handed to its graph run,
+        so the (sequential, transactional) graph runs only validation and
+        persistence per message.
+
         Args:
             messages: List of raw SSM messages
             batch_size: Number of messages to process per batch
+            max_workers: Parse worker processes (default: CPU count)
 
         Returns:
             Batch processing results
         """
         logger.info(f"Processing batch of {len(messages)} messages")
 
+        workers = max_workers or os.cpu_count() or 1
+        parallel = len(messages) >= PARALLEL_PARSE_THRESHOLD and workers > 1
+        executor = ProcessPoolExecutor(max_workers=workers) if parallel else None
+        primed: Dict[str, tuple] = {}
+        primed_until = 0
+
         results = {
             "total": len(messages),
             "successful": 0,
@@ -325,21 +544,34 @@ class SSMParserAgent:
             "results": []
         }
 
-        # Process in batches
-        for i in range(0, len(messages), batch_size):
-            batch = messages[i:i + batch_size]
-            logger.info(f"Processing batch {i // batch_size + 1}")
-
-            for message in batch:
-                result = self.process(message)
-                results["results"].append(result)
-
-                if result["status"] == ProcessingStatus.COMPLETED.value:
-                    results["successful"] += 1
-                elif result["status"] == ProcessingStatus.REJECTED.value:
-                    results["rejected"] += 1
-                else:
-                    results["failed"] += 1
+        try:
+            # Process in batches
+            for i in range(0, len(messages), batch_size):
+                batch = messages[i:i + batch_size]
+                logger.info(f"Processing batch {i // batch_size + 1}")
+
+                # Pre-parse the next window ahead of the graph
+                if executor is not None and i >= primed_until:
+                    primed_until = i + PARALLEL_PARSE_WINDOW
+                    primed = self._prime_parses(
+                        executor, messages[i:primed_until], workers
+                    )
+
+                for message in batch:
+                    result = self.process(
+                        message, primed_parse=primed.get(message.strip())
+                    )
+                    results["results"].append(result)
+
+                    if result["status"] == ProcessingStatus.COMPLETED.value:
+                        results["successful"] += 1
+                    elif result["status"] == ProcessingStatus.REJECTED.value:
+                        results["rejected"] += 1
+                    else:
+                        results["failed"] += 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         logger.info(
             f"Batch processing complete: "
@@ -350,6 +582,70 @@ class SSMParserAgent:
 
         return results
 
+    def process_ssim_stream(
+        self,
+        lines: Iterable[str],
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Stream a full SSIM schedule dump straight into the database
+
+        Flights are parsed, validated and transformed one at a time and
+        bulk-loaded in chunks, so memory is bounded by the chunk size rather
+        than the file size. Invalid flights are skipped and counted.
+
+        Args:
+            lines: SSIM lines, e.g. an open file
+            chunk_size: Records per COPY batch
+
+        Returns:
+            Load summary with the IDs of the loaded flights
+        """
+        start_ns = time.perf_counter_ns()
+        message_id = str(uuid.uuid4())
+        counts = {"successful": 0, "rejected": 0}
+        today = date.today()
+
+        def records():
+            for parsed in self.ssim_parser.iter_flights(lines):
+                # Each Type 3 record describes a new flight
+                validation = self.validator.validate(
+                    parsed, MessageType.NEW.value, today
+                )
+                if not validation["is_valid"]:
+                    counts["rejected"] += 1
+                    continue
+
+                counts["successful"] += 1
+                yield from self.transformer.transform(
+                    parsed, MessageType.NEW.value, message_id
+                )
+
+        try:
+            affected_flight_ids = self.db_writer.copy_stream(records(), chunk_size)
+        except Exception as e:
+            logger.error(f"Error streaming SSIM dump: {str(e)}", exc_info=True)
+            return {
+                "message_id": message_id,
+                "status": ProcessingStatus.FAILED.value,
+                "error": str(e),
+                "processing_time_ms": _elapsed_ms(start_ns)
+            }
+
+        logger.info(
+            f"SSIM stream loaded: {counts['successful']} flights, "
+            f"{counts['rejected']} rejected"
+        )
+
+        return {
+            "message_id": message_id,
+            "status": ProcessingStatus.COMPLETED.value,
+            "total": counts["successful"] + counts["rejected"],
+            **counts,
+            "affected_flight_ids": affected_flight_ids,
+            "processing_time_ms": _elapsed_ms(start_ns)
+        }
+
     # =========================================================================
     # WORKFLOW NODES
     # =========================================================================
@@ -357,16 +653,16 @@ class SSMParserAgent:
     def detect_message_format(self, state: SSMParserState) -> SSMParserState:
         """Detect message format (SSM, SSIM, or unknown)"""
         raw_message = state["raw_message"]
+        stripped = raw_message.lstrip()
 
         # Check for SSM format (starts with message type)
-        ssm_pattern = r"^(NEW|TIM|EQT|CNL|CON|SKD|RPL|ADM)"
-        if raw_message.strip().startswith(tuple(MessageType)):
+        if stripped[:3] in _SSM_PREFIXES:
             state["message_format"] = MessageFormat.SSM.value
             # Extract message type (first word)
-            state["message_type"] = raw_message.split()[0].upper()
+            state["message_type"] = stripped.split(None, 1)[0].upper()
 
         # Check for SSIM format (starts with '3 ' or '4 ')
-        elif raw_message.strip().startswith(('3 ', '4 ')):
+        elif stripped[:2] in ('3 ', '4 '):
             state["message_format"] = MessageFormat.SSIM.value
             state["message_type"] = "SSIM"
 
@@ -384,9 +680,13 @@ class SSMParserAgent:
     def parse_ssm_message(self, state: SSMParserState) -> SSMParserState:
         """Parse SSM format message using regex"""
         try:
-            parsed_data = self.ssm_parser.parse(
-                state["raw_message"],
-                state["message_type"]
+            parsed_data = self._parsed(
+                state,
+                "parse_ssm",
+                lambda: self.ssm_parser.parse(
+                    state["raw_message"],
+                    state["message_type"]
+                )
             )
             state["parsed_data"] = parsed_data
             state["parsing_method"] = "regex"
@@ -396,8 +696,8 @@ class SSMParserAgent:
 
         except Exception as e:
             logger.error(f"SSM parsing failed: {str(e)}")
-            # Try LLM fallback if enabled
-            if self.use_llm_fallback:
+            # Try LLM fallback if enabled and the message is not obvious garbage
+            if self.use_llm_fallback and _looks_like_ssm(state["raw_message"]):
                 state["parsing_method"] = "llm_fallback"
                 return self.parse_with_llm_fallback(state)
             else:
@@ -408,7 +708,11 @@ class SSMParserAgent:
     def parse_ssim_message(self, state: SSMParserState) -> SSMParserState:
         """Parse SSIM format message"""
         try:
-            parsed_data = self.ssim_parser.parse(state["raw_message"])
+            parsed_data = self._parsed(
+                state,
+                "parse_ssim",
+                lambda: self.ssim_parser.parse(state["raw_message"])
+            )
             state["parsed_data"] = parsed_data
             state["parsing_method"] = "regex"
             state["confidence_score"] = parsed_data.get("confidence", 1.0)
@@ -452,13 +756,23 @@ class SSMParserAgent:
             return state
 
         try:
-            validation_result = self.validator.validate(
-                state["parsed_data"],
-                state["message_type"]
-            )
+            def run_validation():
+                return self.validator.validate(
+                    state["parsed_data"],
+                    state["message_type"]
+                )
 
-            state["validation_errors"] = validation_result["errors"]
-            state["validation_warnings"] = validation_result["warnings"]
+            # LLM output is not deterministic, so only regex parses are cached
+            if state["parsing_method"] == "regex":
+                validation_result = self._cached(
+                    "validate", state["raw_message"], run_validation
+                )
+            else:
+                validation_result = run_validation()
+
+            # Copy lists so later nodes never mutate a cached result
+            state["validation_errors"] = list(validation_result["errors"])
+            state["validation_warnings"] = list(validation_result["warnings"])
             state["is_valid"] = validation_result["is_valid"]
 
             if state["is_valid"]:
@@ -485,9 +799,10 @@ class SSMParserAgent:
             )
 
             state["database_records"] = records
-            state["affected_flight_ids"] = [
+            # Order-preserving dedup: one flight can appear in several records
+            state["affected_flight_ids"] = list(dict.fromkeys(
                 r["flight_id"] for r in records if "flight_id" in r
-            ]
+            ))
 
             logger.info(f"Transformed to {len(records)} database records")
 
@@ -508,6 +823,10 @@ class SSMParserAgent:
 
             state["duplicate_status"] = duplicate_status
 
+            if duplicate_status == "duplicate":
+                state["processing_status"] = ProcessingStatus.REJECTED.value
+                state["error_message"] = "Duplicate message"
+
             logger.info(f"Duplicate check: {duplicate_status}")
 
         except Exception as e:
@@ -607,51 +926,81 @@ class SSMParserAgent:
     # HELPER METHODS
     # =========================================================================
 
-    def _llm_assisted_parse(self, raw_message: str) -> Dict[str, Any]:
-        """Use Claude to parse complex or ambiguous SSM messages"""
+    def _completed_run(self, config: Dict[str, Any]) -> Optional[SSMParserState]:
+        """Return the final state of an earlier completed run, if checkpointed"""
+        snapshot = self.graph.get_state(config)
+        if snapshot.next or snapshot.values.get("processing_status") != ProcessingStatus.COMPLETED.value:
+            return None
+        return dict(snapshot.values)
 
-        system_prompt = """You are an expert in IATA SSM and SSIM message formats.
-Parse airline schedule messages with precision according to IATA standards.
+    def _prime_parses(
+        self,
+        executor: ProcessPoolExecutor,
+        messages: List[str],
+        max_workers: int
+    ) -> Dict[str, tuple]:
+        """Parse messages in worker processes, keyed by stripped message"""
+        raw_messages = list(dict.fromkeys(m.strip() for m in messages))
+        chunksize = max(1, len(raw_messages) // (4 * max_workers))
 
-SSM Format Examples:
-- NEW CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 738 0715 0945 0230 E0 M JP
-- TIM CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 0725 0955
-- EQT CM 0100 PTY MIA 1234567 1DEC24 31MAR25 73J
-- CNL CM 0100 PTY MIA 1234567 15JAN25 20JAN25
+        results = executor.map(_parse_in_worker, raw_messages, chunksize=chunksize)
+        return {
+            raw_message: result
+            for raw_message, result in zip(raw_messages, results)
+            if result is not None
+        }
+
+    def _parsed(self, state: SSMParserState, node: str, compute):
+        """
+        Return a parse node's result: pre-parsed by process_batch, else cached
 
-SSIM Format Example:
-- 3 CM 0100JPTYMIA1234567 01DEC2431MAR25738 0715 0945 0230 E0 M JP
+        Pre-parsed results bypass the node cache, whose LRU eviction would
+        drop them before their message reaches the graph.
+        """
+        primed = state.get("primed_parse")
+        if primed is not None and primed[0] == node:
+            return primed[1]
 
-Return a JSON object with all extracted fields. Include a 'confidence' score (0-1)
-and list any 'ambiguities' found."""
+        return self._cached(node, state["raw_message"], compute)
 
-        user_prompt = f"""Parse this airline schedule message:
+    def _cached(self, node: str, raw_message: str, compute):
+        """
+        Return the cached result of a deterministic node, computing it on miss
 
-{raw_message}
+        Failures are not cached, so a raising ``compute`` is retried next time.
+        """
+        key = (node, _message_key(raw_message))
+        with self._node_cache_lock:
+            try:
+                return self.node_cache[key]
+            except KeyError:
+                pass
+
+        result = compute()
+        with self._node_cache_lock:
+            self.node_cache[key] = result
+        return result
 
-Extract all fields according to IATA standards and return as JSON."""
+    def _llm_assisted_parse(self, raw_message: str) -> Dict[str, Any]:
+        """Use Claude to parse complex or ambiguous SSM messages"""
 
         messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt)
+            SystemMessage(content=LLM_PARSE_PROMPT),
+            HumanMessage(content=raw_message.rstrip())
         ]
 
-        response = self.llm.invoke(messages)
+        result = self.llm.with_structured_output(ParsedSSM, include_raw=True).invoke(messages)
+        if result["parsing_error"] is not None:
+            raise result["parsing_error"]
 
-        # Parse JSON from response
-        try:
-            parsed_data = json.loads(response.content)
-            parsed_data["tokens_used"] = response.usage_metadata.get("total_tokens", 0)
-            return parsed_data
-        except json.JSONDecodeError:
-            # Try to extract JSON from markdown code blocks
-            content = response.content
-            if "```json" in content:
-                json_str = content.split("```json")[1].split("```")[0].strip()
-                parsed_data = json.loads(json_str)
-                parsed_data["tokens_used"] = response.usage_metadata.get("total_tokens", 0)
-                return parsed_data
-            raise
+        parsed = result["parsed"]
+        parsed_data = self.ssm_parser._post_process(
+            parsed.model_dump(exclude={"confidence"}, exclude_none=True),
+            parsed.message_type
+        )
+        parsed_data["confidence"] = parsed.confidence
+        parsed_data["tokens_used"] = (result["raw"].usage_metadata or {}).get("total_tokens", 0)
+        return parsed_data
 
     def _generate_ack_message(self, state: SSMParserState) -> str:
         """Generate IATA ACK (acknowledgment) message"""
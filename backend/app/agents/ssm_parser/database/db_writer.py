@@ -3,23 +3,136 @@ Database Writer
 Writes SSM parsed data to PostgreSQL database
 """
 
-import json
+import io
+import csv
 import uuid
-from typing import Dict, Any, List
-from datetime import datetime
+import weakref
+from itertools import islice
+from typing import Dict, Any, List, Iterable, Sequence, Tuple
+
+import orjson
+from psycopg2.extras import execute_values
+
+
+# Batches larger than this are loaded with COPY instead of per-row INSERTs
+COPY_THRESHOLD = 50
+
+# Records held in memory per COPY when streaming a full schedule dump
+STREAM_CHUNK_SIZE = 5000
+
+# Rows per multi-VALUES INSERT statement (execute_values page size)
+INSERT_PAGE_SIZE = 500
+
+SSM_MESSAGE_COLUMNS = (
+    "message_id", "message_type", "message_format",
+    "raw_message", "parsed_data", "sender_airline",
+    "processing_status", "validation_errors"
+)
+
+# Bulk-saved messages are written after their flights, with the affected
+# flight IDs known up front
+SSM_MESSAGE_BULK_COLUMNS = SSM_MESSAGE_COLUMNS + ("affected_flight_ids",)
+
+FLIGHT_COLUMNS = (
+    "flight_id", "schedule_id", "flight_number", "carrier_code",
+    "origin_airport", "destination_airport",
+    "departure_time", "arrival_time",
+    "departure_day_offset", "arrival_day_offset",
+    "operating_days", "effective_from", "effective_to",
+    "aircraft_type", "service_type", "frequency_per_week",
+    "meal_service", "secure_flight_required", "metadata"
+)
+
+LEG_COLUMNS = (
+    "leg_id", "flight_id", "leg_sequence",
+    "departure_airport", "arrival_airport",
+    "departure_time", "arrival_time",
+    "departure_day_offset", "arrival_day_offset",
+    "aircraft_type"
+)
+# Serialized empty metadata object, shared by flights without metadata
+_EMPTY_JSONB = "{}"
+
+# Selects the first flight matching an update record's key ($1-$7),
+# answered by an index-only scan on idx_flights_ssm_match (schema 006)
+_FIND_FLIGHT = """
+    SELECT flight_id FROM flights
+    WHERE carrier_code = $1
+      AND flight_number = $2
+      AND origin_airport = $3
+      AND destination_airport = $4
+      AND operating_days = $5
+      AND effective_from <= $6
+      AND effective_to >= $7
+    LIMIT 1
+"""
+
+# Server-side prepared statements for the per-record flight update path,
+# prepared once per connection and run with EXECUTE. Each update locates
+# and modifies the flight in one statement and returns its ID.
+PREPARED_STATEMENTS = {
+    "ssm_find_flight": _FIND_FLIGHT,
+    "ssm_upd_time": f"""
+        UPDATE flights
+        SET departure_time = $8,
+            arrival_time = $9,
+            updated_at = NOW()
+        WHERE flight_id = ({_FIND_FLIGHT})
+        RETURNING flight_id
+    """,
+    "ssm_upd_eqt": f"""
+        UPDATE flights
+        SET aircraft_type = $8,
+            updated_at = NOW()
+        WHERE flight_id = ({_FIND_FLIGHT})
+        RETURNING flight_id
+    """,
+    "ssm_upd_cnl": f"""
+        UPDATE flights
+        SET metadata = jsonb_set(
+            COALESCE(metadata, '{{}}'::jsonb),
+            '{{cancelled}}',
+            'true'::jsonb
+        ),
+        updated_at = NOW()
+        WHERE flight_id = ({_FIND_FLIGHT})
+        RETURNING flight_id
+    """,
+}
+
+# update_type -> (prepared statement, record fields bound after the key)
+# Other update types only look the flight up.
+FLIGHT_UPDATES = {
+    "time_change": ("ssm_upd_time", ("new_departure_time", "new_arrival_time")),
+    "equipment_change": ("ssm_upd_eqt", ("new_aircraft_type",)),
+    "cancellation": ("ssm_upd_cnl", ()),
+}
+
+# Connections that already hold PREPARED_STATEMENTS (prepared statements
+# live for the session, so pooled connections are only prepared once)
+_prepared_connections = weakref.WeakKeyDictionary()
+
+
+def _dumps(obj: Any) -> str:
+    """orjson-backed JSON encoder for JSONB values in INSERT and COPY rows"""
+    return orjson.dumps(obj).decode()
 
 
 class DatabaseWriter:
     """Write SSM records to PostgreSQL"""
 
-    def __init__(self, db_connection):
+    def __init__(self, db_connection, connection_pool=None):
         """
         Initialize database writer
 
         Args:
             db_connection: PostgreSQL database connection
+            connection_pool: Optional psycopg2 ThreadedConnectionPool; when
+                given, each save checks out its own connection so concurrent
+                writers don't serialize on db_connection
         """
         self.db = db_connection
+        self.pool = connection_pool
 
     def save(
         self,
@@ -44,64 +157,45 @@ class DatabaseWriter:
         Returns:
             Result with SSM record ID and affected flight IDs
         """
-        cursor = self.db.cursor()
+        conn = self._getconn()
+        cursor = conn.cursor()
         ssm_record_id = str(uuid.uuid4())
-        affected_flight_ids = []
 
         try:
-            # Begin transaction
-            cursor.execute("BEGIN")
-
-            # 1. Insert SSM message record
+            # 1. Begin transaction and insert SSM message record. psycopg2
+            #    has no pipeline mode, so statements that don't need each
+            #    other's results share one round trip instead.
             cursor.execute(
                 """
-                INSERT INTO ssm_messages (
-                    message_id, message_type, message_format,
-                    raw_message, parsed_data, sender_airline,
-                    received_at, processing_status, validation_errors
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
+                BEGIN;
+                INSERT INTO ssm_messages ({})
+                VALUES %s
+                """.format(", ".join(SSM_MESSAGE_COLUMNS)),
+                (self._ssm_message_row(
                     ssm_record_id,
+                    raw_message,
                     message_type,
                     message_format,
-                    raw_message,
-                    json.dumps(parsed_data),
-                    parsed_data.get("airline"),
-                    datetime.now(),
-                    "completed" if not validation_errors else "failed",
-                    json.dumps(validation_errors)
-                )
+                    parsed_data,
+                    validation_errors
+                ),)
             )
 
-            # 2. Process records
-            for record in records:
-                if record["record_type"] == "flight":
-                    flight_id = self._insert_flight(cursor, record)
-                    affected_flight_ids.append(flight_id)
+            # 2. Insert flights/legs and apply updates
+            affected_flight_ids = self._write_records(cursor, records)
 
-                elif record["record_type"] == "flight_leg":
-                    self._insert_flight_leg(cursor, record)
-
-                elif record["record_type"] == "flight_update":
-                    flight_id = self._apply_flight_update(cursor, record)
-                    if flight_id:
-                        affected_flight_ids.append(flight_id)
-
-            # 3. Update SSM message with affected flights
+            # 3. Update SSM message with affected flights and commit in the
+            #    same round trip
             cursor.execute(
                 """
                 UPDATE ssm_messages
-                SET affected_flight_ids = %s
-                WHERE message_id = %s
+                SET affected_flight_ids = %s::uuid[]
+                WHERE message_id = %s;
+                COMMIT
                 """,
                 (affected_flight_ids, ssm_record_id)
             )
 
-            # Commit transaction
-            cursor.execute("COMMIT")
-
             return {
                 "ssm_record_id": ssm_record_id,
                 "affected_flight_ids": affected_flight_ids
@@ -114,155 +208,365 @@ class DatabaseWriter:
 
         finally:
             cursor.close()
+            self._putconn(conn)
 
-    def _insert_flight(self, cursor, record: Dict[str, Any]) -> str:
-        """Insert new flight record"""
-        cursor.execute(
-            """
-            INSERT INTO flights (
-                flight_id, schedule_id, flight_number, carrier_code,
-                origin_airport, destination_airport,
-                departure_time, arrival_time,
-                departure_day_offset, arrival_day_offset,
-                operating_days, effective_from, effective_to,
-                aircraft_type, service_type, frequency_per_week,
-                meal_service, secure_flight_required, metadata
+    def save_many(self, messages: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Save a batch of SSM messages in one transaction
+
+        Each message's flights and legs are written first, so the
+        ssm_messages rows can then be loaded in one pass with their affected
+        flight IDs already set: COPY for large batches (e.g. backfills),
+        one multi-VALUES INSERT otherwise. Useful for bulk reprocessing.
+
+        Args:
+            messages: Dicts with the keyword arguments of save() (records,
+                raw_message, message_type, message_format, parsed_data,
+                validation_errors)
+
+        Returns:
+            One result per message, as returned by save()
+        """
+        messages = list(messages)
+        if not messages:
+            return []
+
+        conn = self._getconn()
+        cursor = conn.cursor()
+        message_ids = [str(uuid.uuid4()) for _ in messages]
+
+        try:
+            cursor.execute("BEGIN")
+
+            affected = [
+                self._write_records(cursor, message["records"])
+                for message in messages
+            ]
+
+            rows = (
+                self._ssm_message_row(
+                    message_id,
+                    message["raw_message"],
+                    message["message_type"],
+                    message["message_format"],
+                    message["parsed_data"],
+                    message["validation_errors"]
+                ) + (self._uuid_array(flight_ids),)
+                for message_id, message, flight_ids
+                in zip(message_ids, messages, affected)
             )
-            VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s
+
+            if len(messages) > COPY_THRESHOLD:
+                self._copy_rows(cursor, "ssm_messages", SSM_MESSAGE_BULK_COLUMNS, rows)
+            else:
+                self._insert_rows(cursor, "ssm_messages", SSM_MESSAGE_BULK_COLUMNS, rows)
+
+            cursor.execute("COMMIT")
+
+            return [
+                {
+                    "ssm_record_id": message_id,
+                    "affected_flight_ids": flight_ids
+                }
+                for message_id, flight_ids in zip(message_ids, affected)
+            ]
+
+        except Exception as e:
+            cursor.execute("ROLLBACK")
+            raise
+
+        finally:
+            cursor.close()
+            self._putconn(conn)
+
+    def copy_stream(
+        self,
+        records: Iterable[Dict[str, Any]],
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> List[str]:
+        """
+        Bulk-load a stream of flight and flight_leg records in chunks
+
+        Only one chunk of records is held in memory at a time. All chunks
+        are committed in a single transaction.
+
+        Args:
+            records: Transformed records, each flight before its legs
+            chunk_size: Records per COPY batch
+
+        Returns:
+            IDs of the loaded flights
+        """
+        conn = self._getconn()
+        cursor = conn.cursor()
+        records = iter(records)
+        affected_flight_ids = []
+
+        try:
+            cursor.execute("BEGIN")
+
+            while True:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    break
+
+                # Flights first, so legs in the same chunk can reference them
+                flights = [r for r in chunk if r["record_type"] == "flight"]
+                if flights:
+                    self._copy_rows(
+                        cursor,
+                        "flights",
+                        FLIGHT_COLUMNS,
+                        (self._flight_row(r) for r in flights)
+                    )
+                    affected_flight_ids.extend(r["flight_id"] for r in flights)
+
+                self._insert_legs(
+                    cursor,
+                    [r for r in chunk if r["record_type"] == "flight_leg"]
+                )
+
+            cursor.execute("COMMIT")
+
+            return affected_flight_ids
+
+        except Exception as e:
+            cursor.execute("ROLLBACK")
+            raise
+
+        finally:
+            cursor.close()
+            self._putconn(conn)
+
+    def _write_records(self, cursor, records: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert a message's flights and legs and apply its flight updates
+
+        Returns:
+            Affected flight IDs (deduplicated, in order)
+        """
+        affected_flight_ids = []
+
+        # Partition records by type in one pass
+        flights, legs, updates = [], [], []
+        by_type = {
+            "flight": flights.append,
+            "flight_leg": legs.append,
+            "flight_update": updates.append
+        }
+        for record in records:
+            add = by_type.get(record["record_type"])
+            if add:
+                add(record)
+
+        # Insert flights and legs in bulk: COPY for large batches
+        # (e.g. schedule dumps), multi-VALUES INSERT otherwise
+        if len(flights) > COPY_THRESHOLD:
+            self._copy_rows(
+                cursor,
+                "flights",
+                FLIGHT_COLUMNS,
+                (self._flight_row(r) for r in flights)
             )
-            RETURNING flight_id
-            """,
-            (
-                record["flight_id"],
-                None,  # schedule_id - to be assigned later
-                record["flight_number"],
-                record["carrier_code"],
-                record["origin_airport"],
-                record["destination_airport"],
-                record["departure_time"],
-                record["arrival_time"],
-                record["departure_day_offset"],
-                record["arrival_day_offset"],
-                record["operating_days"],
-                record["effective_from"],
-                record["effective_to"],
-                record["aircraft_type"],
-                record["service_type"],
-                record["frequency_per_week"],
-                record.get("meal_service"),
-                record.get("secure_flight_required", True),
-                json.dumps(record.get("metadata", {}))
+            affected_flight_ids.extend(r["flight_id"] for r in flights)
+        elif flights:
+            inserted = self._insert_rows(
+                cursor,
+                "flights",
+                FLIGHT_COLUMNS,
+                (self._flight_row(r) for r in flights),
+                returning="flight_id"
             )
+            affected_flight_ids.extend(str(row[0]) for row in inserted)
+
+        self._insert_legs(cursor, legs)
+
+        # Updates need a lookup per flight, so they stay per record
+        if updates:
+            self._prepare_statements(cursor)
+        for record in updates:
+            flight_id = self._apply_flight_update(cursor, record)
+            if flight_id:
+                affected_flight_ids.append(flight_id)
+
+        return list(dict.fromkeys(affected_flight_ids))
+
+    def _ssm_message_row(
+        self,
+        message_id: str,
+        raw_message: str,
+        message_type: str,
+        message_format: str,
+        parsed_data: Dict[str, Any],
+        validation_errors: List[str]
+    ) -> Tuple:
+        """
+        Build an ssm_messages row tuple in SSM_MESSAGE_COLUMNS order
+
+        received_at is left to the column default (NOW()), so every row in
+        a transaction shares the server's transaction timestamp. JSONB
+        values are serialized text, usable by both INSERT and COPY.
+        """
+        return (
+            message_id,
+            message_type,
+            message_format,
+            raw_message,
+            _dumps(parsed_data),
+            parsed_data.get("airline"),
+            "completed" if not validation_errors else "failed",
+            _dumps(validation_errors)
         )
 
-        return record["flight_id"]
+    def _getconn(self):
+        """Check out a pooled connection, or use the shared one"""
+        return self.pool.getconn() if self.pool is not None else self.db
 
-    def _insert_flight_leg(self, cursor, record: Dict[str, Any]):
-        """Insert flight leg record"""
-        cursor.execute(
-            """
-            INSERT INTO flight_legs (
-                leg_id, flight_id, leg_sequence,
-                departure_airport, arrival_airport,
-                departure_time, arrival_time,
-                departure_day_offset, arrival_day_offset,
-                aircraft_type
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-            (
-                record["leg_id"],
-                record["flight_id"],
-                record["leg_sequence"],
-                record["departure_airport"],
-                record["arrival_airport"],
-                record["departure_time"],
-                record["arrival_time"],
-                record["departure_day_offset"],
-                record["arrival_day_offset"],
-                record.get("aircraft_type")
-            )
+    def _putconn(self, conn):
+        """Return a connection checked out by _getconn"""
+        if self.pool is not None:
+            self.pool.putconn(conn)
+
+    def _insert_rows(
+        self,
+        cursor,
+        table: str,
+        columns: Sequence[str],
+        rows: Iterable[Tuple],
+        returning: str = None
+    ) -> List[Tuple]:
+        """
+        Insert rows with one multi-VALUES statement per INSERT_PAGE_SIZE rows
+
+        Returns the RETURNING rows when ``returning`` is given.
+        """
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+        if returning:
+            sql += f" RETURNING {returning}"
+
+        return execute_values(
+            cursor,
+            sql,
+            rows,
+            page_size=INSERT_PAGE_SIZE,
+            fetch=returning is not None
+        ) or []
+
+    def _flight_row(self, record: Dict[str, Any]) -> Tuple:
+        """Build a flights row tuple in FLIGHT_COLUMNS order"""
+        return (
+            record["flight_id"],
+            None,  # schedule_id - to be assigned later
+            record["flight_number"],
+            record["carrier_code"],
+            record["origin_airport"],
+            record["destination_airport"],
+            record["departure_time"],
+            record["arrival_time"],
+            record["departure_day_offset"],
+            record["arrival_day_offset"],
+            record["operating_days"],
+            record["effective_from"],
+            record["effective_to"],
+            record["aircraft_type"],
+            record["service_type"],
+            record["frequency_per_week"],
+            record.get("meal_service"),
+            record.get("secure_flight_required", True),
+            self._metadata_json(record.get("metadata"))
         )
 
-    def _apply_flight_update(self, cursor, record: Dict[str, Any]) -> str:
-        """Apply flight update (TIM, EQT, CNL)"""
-        # Find matching flight
-        cursor.execute(
-            """
-            SELECT flight_id FROM flights
-            WHERE carrier_code = %s
-              AND flight_number = %s
-              AND origin_airport = %s
-              AND destination_airport = %s
-              AND operating_days = %s
-              AND effective_from <= %s
-              AND effective_to >= %s
-            LIMIT 1
-            """,
-            (
-                record["carrier_code"],
-                record["flight_number"],
-                record["origin_airport"],
-                record["destination_airport"],
-                record["operating_days"],
-                record["effective_to"],
-                record["effective_from"]
-            )
+    @staticmethod
+    def _uuid_array(ids: List[str]) -> str:
+        """Postgres array literal for a UUID[] column (INSERT or COPY)"""
+        return "{" + ",".join(ids) + "}"
+
+    @staticmethod
+    def _metadata_json(metadata: Dict[str, Any]) -> str:
+        """Serialize flight metadata, reusing a constant for the common empty case"""
+        return _dumps(metadata) if metadata else _EMPTY_JSONB
+
+    def _copy_rows(
+        self,
+        cursor,
+        table: str,
+        columns: Sequence[str],
+        rows: Iterable[Tuple]
+    ):
+        """
+        Bulk-load rows with COPY FROM STDIN (CSV)
+
+        None is written as an unquoted empty field, which COPY reads as NULL.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(row)
+        buffer.seek(0)
+
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
         )
 
-        result = cursor.fetchone()
-        if not result:
-            return None
+    def _insert_legs(self, cursor, legs: List[Dict[str, Any]]):
+        """Insert flight legs: COPY for large batches, multi-VALUES INSERT otherwise"""
+        if not legs:
+            return
 
-        flight_id = result[0]
+        rows = (self._leg_row(r) for r in legs)
+        if len(legs) > COPY_THRESHOLD:
+            self._copy_rows(cursor, "flight_legs", LEG_COLUMNS, rows)
+        else:
+            self._insert_rows(cursor, "flight_legs", LEG_COLUMNS, rows)
 
-        # Apply update based on type
-        if record["update_type"] == "time_change":
-            cursor.execute(
-                """
-                UPDATE flights
-                SET departure_time = %s,
-                    arrival_time = %s,
-                    updated_at = NOW()
-                WHERE flight_id = %s
-                """,
-                (
-                    record["new_departure_time"],
-                    record["new_arrival_time"],
-                    flight_id
-                )
-            )
+    def _leg_row(self, record: Dict[str, Any]) -> Tuple:
+        """Build a flight_legs row tuple in LEG_COLUMNS order"""
+        return (
+            record["leg_id"],
+            record["flight_id"],
+            record["leg_sequence"],
+            record["departure_airport"],
+            record["arrival_airport"],
+            record["departure_time"],
+            record["arrival_time"],
+            record["departure_day_offset"],
+            record["arrival_day_offset"],
+            record.get("aircraft_type")
+        )
 
-        elif record["update_type"] == "equipment_change":
-            cursor.execute(
-                """
-                UPDATE flights
-                SET aircraft_type = %s,
-                    updated_at = NOW()
-                WHERE flight_id = %s
-                """,
-                (record["new_aircraft_type"], flight_id)
-            )
+    def _prepare_statements(self, cursor):
+        """PREPARE the flight update statements once per connection"""
+        if cursor.connection in _prepared_connections:
+            return
 
-        elif record["update_type"] == "cancellation":
-            # Mark flight as cancelled (implementation varies)
-            cursor.execute(
-                """
-                UPDATE flights
-                SET metadata = jsonb_set(
-                    COALESCE(metadata, '{}'::jsonb),
-                    '{cancelled}',
-                    'true'::jsonb
-                ),
-                updated_at = NOW()
-                WHERE flight_id = %s
-                """,
-                (flight_id,)
-            )
+        for name, sql in PREPARED_STATEMENTS.items():
+            cursor.execute(f"PREPARE {name} AS {sql}")
+        _prepared_connections[cursor.connection] = True
 
-        return flight_id
+    def _apply_flight_update(self, cursor, record: Dict[str, Any]) -> str:
+        """Apply flight update (TIM, EQT, CNL)"""
+        statement, fields = FLIGHT_UPDATES.get(
+            record["update_type"], ("ssm_find_flight", ())
+        )
+        params = (
+            record["carrier_code"],
+            record["flight_number"],
+            record["origin_airport"],
+            record["destination_airport"],
+            record["operating_days"],
+            record["effective_to"],
+            record["effective_from"],
+            *(record[field] for field in fields)
+        )
+
+        cursor.execute(
+            f"EXECUTE {statement} ({', '.join(['%s'] * len(params))})",
+            params
+        )
+
+        result = cursor.fetchone()
+        return result[0] if result else None
 
     def check_duplicate(
         self,
@@ -6,6 +6,43 @@ Updates Neo4j graph with flight schedule relationships
 from typing import Dict, Any, List
 
 
+# Maximum flights merged per UNWIND query
+NEO4J_BATCH_SIZE = 20000
+
+REFERENCE_NODES_QUERY = """
+MERGE (airline:Airline {code: $airline_code})
+ON CREATE SET airline.name = $airline_code
+
+FOREACH (code IN $airports |
+    MERGE (:Airport {code: code}))
+
+FOREACH (code IN $aircraft_types |
+    MERGE (:AircraftType {code: code}))
+"""
+
+FLIGHT_UPSERT_QUERY = """
+UNWIND $rows AS row
+MERGE (flight:Flight {id: row.id})
+SET flight += row.props
+
+WITH flight
+MATCH (airline:Airline {code: $airline_code})
+MERGE (airline)-[:OPERATES]->(flight)
+
+WITH flight
+MATCH (origin:Airport {code: $origin})
+MERGE (flight)-[:DEPARTS_FROM]->(origin)
+
+WITH flight
+MATCH (dest:Airport {code: $destination})
+MERGE (flight)-[:ARRIVES_AT]->(dest)
+
+WITH flight
+MATCH (aircraft:AircraftType {code: $aircraft_type})
+MERGE (flight)-[:USES_AIRCRAFT]->(aircraft)
+"""
+
+
 class Neo4jWriter:
     """Write flight data to Neo4j knowledge graph"""
 
@@ -34,66 +71,50 @@ class Neo4jWriter:
         - Relationships between entities
         """
         with self.driver.session() as session:
-            # Create/update airline node
-            session.run(
-                """
-                MERGE (airline:Airline {code: $code})
-                ON CREATE SET airline.name = $name
-                """,
-                code=parsed_data.get("airline"),
-                name=parsed_data.get("airline")
-            )
+            # Create/update airline, airport and aircraft nodes in one
+            # write transaction, before the flights that reference them
+            session.execute_write(self._upsert_reference_nodes, parsed_data)
 
-            # Create/update airport nodes
-            for airport_field in ["origin", "destination"]:
-                if airport_field in parsed_data:
-                    session.run(
-                        """
-                        MERGE (airport:Airport {code: $code})
-                        """,
-                        code=parsed_data[airport_field]
-                    )
-
-            # Create/update aircraft node
-            if "aircraft_type" in parsed_data:
-                session.run(
-                    """
-                    MERGE (aircraft:AircraftType {code: $code})
-                    """,
-                    code=parsed_data["aircraft_type"]
-                )
+            # Create flight nodes and relationships, one UNWIND per chunk
+            props = {
+                "number": f"{parsed_data['airline']}{parsed_data['flight_number']}",
+                "departure_time": parsed_data.get("departure_time", ""),
+                "arrival_time": parsed_data.get("arrival_time", "")
+            }
+            rows = [{"id": flight_id, "props": props} for flight_id in flight_ids]
 
-            # Create flight node and relationships
-            for flight_id in flight_ids:
-                session.run(
-                    """
-                    MERGE (flight:Flight {id: $flight_id})
-                    SET flight.number = $flight_number,
-                        flight.departure_time = $departure,
-                        flight.arrival_time = $arrival
-
-                    WITH flight
-                    MATCH (airline:Airline {code: $airline_code})
-                    MERGE (airline)-[:OPERATES]->(flight)
-
-                    WITH flight
-                    MATCH (origin:Airport {code: $origin})
-                    MERGE (flight)-[:DEPARTS_FROM]->(origin)
-
-                    WITH flight
-                    MATCH (dest:Airport {code: $destination})
-                    MERGE (flight)-[:ARRIVES_AT]->(dest)
-
-                    WITH flight
-                    MATCH (aircraft:AircraftType {code: $aircraft_type})
-                    MERGE (flight)-[:USES_AIRCRAFT]->(aircraft)
-                    """,
-                    flight_id=flight_id,
-                    flight_number=f"{parsed_data['airline']}{parsed_data['flight_number']}",
-                    departure=parsed_data.get("departure_time", ""),
-                    arrival=parsed_data.get("arrival_time", ""),
-                    airline_code=parsed_data["airline"],
-                    origin=parsed_data.get("origin"),
-                    destination=parsed_data.get("destination"),
-                    aircraft_type=parsed_data.get("aircraft_type")
+            for start in range(0, len(rows), NEO4J_BATCH_SIZE):
+                session.execute_write(
+                    self._upsert_flights,
+                    rows[start:start + NEO4J_BATCH_SIZE],
+                    parsed_data
                 )
+
+    @staticmethod
+    def _upsert_reference_nodes(tx, parsed_data: Dict[str, Any]):
+        """Merge the airline, airport and aircraft nodes for a message"""
+        tx.run(
+            REFERENCE_NODES_QUERY,
+            airline_code=parsed_data.get("airline"),
+            airports=[
+                parsed_data[field]
+                for field in ("origin", "destination")
+                if field in parsed_data
+            ],
+            aircraft_types=(
+                [parsed_data["aircraft_type"]]
+                if "aircraft_type" in parsed_data else []
+            )
+        )
+
+    @staticmethod
+    def _upsert_flights(tx, rows: List[Dict[str, Any]], parsed_data: Dict[str, Any]):
+        """Merge a chunk of flight nodes and their relationships in one query"""
+        tx.run(
+            FLIGHT_UPSERT_QUERY,
+            rows=rows,
+            airline_code=parsed_data["airline"],
+            origin=parsed_data.get("origin"),
+            destination=parsed_data.get("destination"),
+            aircraft_type=parsed_data.get("aircraft_type")
+        )
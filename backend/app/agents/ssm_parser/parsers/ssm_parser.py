@@ -4,8 +4,171 @@ Regex-based parser for IATA Standard Schedule Messages (SSM)
 """
 
 import re
+from concurrent.futures import Executor
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+
+
+# SSM format regex patterns, compiled once at import and keyed by message type.
+# Lines are dispatched on their first word, so each line is matched against
+# exactly one pattern and lines with an unknown type never reach the engine.
+_FIELD_RE: Dict[str, re.Pattern] = {
+    # NEW CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 738 0715 0945 0230 E0 M JP
+    "NEW": re.compile(
+        r"^NEW\s+"
+        r"(?P<airline>[A-Z0-9]{2,3})\s+"
+        r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
+        r"(?P<service_type>[JFCH])\s+"
+        r"(?P<origin>[A-Z]{3})\s+"
+        r"(?P<destination>[A-Z]{3})\s+"
+        r"(?P<operating_days>[1-7X]{7})\s+"
+        r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
+        r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})\s+"
+        r"(?P<aircraft_type>[A-Z0-9]{3})\s+"
+        r"(?P<departure_time>\d{4})\s+"
+        r"(?P<arrival_time>\d{4})"
+        r"(?:\s+(?P<block_time>\d{4}))?"
+        r"(?:\s+(?P<day_change>[E+-]\d))?"
+        r"(?:\s+(?P<meal_service>[BMSLRNVKODFC]))?"
+        r"(?:\s+(?P<secure_flight>[A-Z]{2}))?"
+        r".*$",
+        re.IGNORECASE
+    ),
+
+    # TIM CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 0725 0955
+    "TIM": re.compile(
+        r"^TIM\s+"
+        r"(?P<airline>[A-Z0-9]{2,3})\s+"
+        r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
+        r"(?P<service_type>[JFCH])?\s*"
+        r"(?P<origin>[A-Z]{3})\s+"
+        r"(?P<destination>[A-Z]{3})\s+"
+        r"(?P<operating_days>[1-7X]{7})\s+"
+        r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
+        r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})\s+"
+        r"(?P<departure_time>\d{4})\s+"
+        r"(?P<arrival_time>\d{4})"
+        r".*$",
+        re.IGNORECASE
+    ),
+
+    # EQT CM 0100 PTY MIA 1234567 1DEC24 31MAR25 73J
+    "EQT": re.compile(
+        r"^EQT\s+"
+        r"(?P<airline>[A-Z0-9]{2,3})\s+"
+        r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
+        r"(?P<origin>[A-Z]{3})\s+"
+        r"(?P<destination>[A-Z]{3})\s+"
+        r"(?P<operating_days>[1-7X]{7})\s+"
+        r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
+        r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})\s+"
+        r"(?P<aircraft_type>[A-Z0-9]{3})"
+        r".*$",
+        re.IGNORECASE
+    ),
+
+    # CNL CM 0100 PTY MIA 1234567 15JAN25 20JAN25
+    "CNL": re.compile(
+        r"^CNL\s+"
+        r"(?P<airline>[A-Z0-9]{2,3})\s+"
+        r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
+        r"(?P<origin>[A-Z]{3})\s+"
+        r"(?P<destination>[A-Z]{3})\s+"
+        r"(?P<operating_days>[1-7X]{7})\s+"
+        r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
+        r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})"
+        r".*$",
+        re.IGNORECASE
+    ),
+
+    # CON CM 0100 PTY MIA 1234567 22JAN25 25JAN25
+    "CON": re.compile(
+        r"^CON\s+"
+        r"(?P<airline>[A-Z0-9]{2,3})\s+"
+        r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
+        r"(?P<origin>[A-Z]{3})\s+"
+        r"(?P<destination>[A-Z]{3})\s+"
+        r"(?P<operating_days>[1-7X]{7})\s+"
+        r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
+        r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})"
+        r".*$",
+        re.IGNORECASE
+    ),
+
+    # SKD CM PTY 1DEC24 31MAR25
+    "SKD": re.compile(
+        r"^SKD\s+"
+        r"(?P<airline>[A-Z0-9]{2,3})\s+"
+        r"(?P<airport>[A-Z]{3})\s+"
+        r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
+        r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})"
+        r".*$",
+        re.IGNORECASE
+    ),
+
+    # RPL CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 738 0715 0945
+    "RPL": re.compile(
+        r"^RPL\s+"
+        r"(?P<airline>[A-Z0-9]{2,3})\s+"
+        r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
+        r"(?P<service_type>[JFCH])\s+"
+        r"(?P<origin>[A-Z]{3})\s+"
+        r"(?P<destination>[A-Z]{3})\s+"
+        r"(?P<operating_days>[1-7X]{7})\s+"
+        r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
+        r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})\s+"
+        r"(?P<aircraft_type>[A-Z0-9]{3})\s+"
+        r"(?P<departure_time>\d{4})\s+"
+        r"(?P<arrival_time>\d{4})"
+        r".*$",
+        re.IGNORECASE
+    )
+}
+
+# Month abbreviation -> month number for DDMMMYY dates
+_MONTHS: Dict[str, int] = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12
+}
+
+# Explicit day change indicator -> arrival day offset (E0, E+1, E-1, ...).
+# Unknown indicators mean no offset.
+_DAY_CHANGE_LUT: Dict[str, int] = {
+    "E0": 0,
+    **{f"E+{n}": n for n in range(10)},
+    **{f"E-{n}": -n for n in range(10)}
+}
+
+# Operating day bitmask -> operating days, bit (day - 1) set for each
+# operating day (1=Monday .. 7=Sunday)
+_OPDAY_DECODE: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(day for day in range(1, 8) if mask >> (day - 1) & 1)
+    for mask in range(128)
+)
+
+# Meal service codes recognised by extract_additional_fields
+_MEAL_SERVICE_CHARS = frozenset("BMSLRNVKODFC")
+
+
+@lru_cache(maxsize=256)
+def _operating_days_mask(pattern: str) -> int:
+    """
+    Encode a 7-character operating days pattern (e.g. X2X4X6X) as a bitmask
+
+    There are only 128 valid patterns, so results are memoized.
+    """
+    if len(pattern) != 7:
+        raise ValueError(f"Invalid operating days pattern: {pattern}")
+
+    mask = 0
+    for bit, (char, digit) in enumerate(zip(pattern, "1234567")):
+        if char == digit:
+            mask |= 1 << bit
+        elif char not in "Xx":
+            raise ValueError(f"Invalid character in operating days: {char}")
+
+    return mask
 
 
 class SSMParser:
@@ -22,119 +185,15 @@ class SSMParser:
     - RPL: Replace
     """
 
-    # SSM Format regex patterns
-    PATTERNS = {
-        # NEW CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 738 0715 0945 0230 E0 M JP
-        "NEW": re.compile(
-            r"^NEW\s+"
-            r"(?P<airline>[A-Z0-9]{2,3})\s+"
-            r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
-            r"(?P<service_type>[JFCH])\s+"
-            r"(?P<origin>[A-Z]{3})\s+"
-            r"(?P<destination>[A-Z]{3})\s+"
-            r"(?P<operating_days>[1-7X]{7})\s+"
-            r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
-            r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})\s+"
-            r"(?P<aircraft_type>[A-Z0-9]{3})\s+"
-            r"(?P<departure_time>\d{4})\s+"
-            r"(?P<arrival_time>\d{4})"
-            r"(?:\s+(?P<block_time>\d{4}))?"
-            r"(?:\s+(?P<day_change>[E+-]\d))?"
-            r"(?:\s+(?P<meal_service>[BMSLRNVKODFC]))?"
-            r"(?:\s+(?P<secure_flight>[A-Z]{2}))?"
-            r".*$",
-            re.IGNORECASE
-        ),
-
-        # TIM CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 0725 0955
-        "TIM": re.compile(
-            r"^TIM\s+"
-            r"(?P<airline>[A-Z0-9]{2,3})\s+"
-            r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
-            r"(?P<service_type>[JFCH])?\s*"
-            r"(?P<origin>[A-Z]{3})\s+"
-            r"(?P<destination>[A-Z]{3})\s+"
-            r"(?P<operating_days>[1-7X]{7})\s+"
-            r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
-            r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})\s+"
-            r"(?P<departure_time>\d{4})\s+"
-            r"(?P<arrival_time>\d{4})"
-            r".*$",
-            re.IGNORECASE
-        ),
-
-        # EQT CM 0100 PTY MIA 1234567 1DEC24 31MAR25 73J
-        "EQT": re.compile(
-            r"^EQT\s+"
-            r"(?P<airline>[A-Z0-9]{2,3})\s+"
-            r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
-            r"(?P<origin>[A-Z]{3})\s+"
-            r"(?P<destination>[A-Z]{3})\s+"
-            r"(?P<operating_days>[1-7X]{7})\s+"
-            r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
-            r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})\s+"
-            r"(?P<aircraft_type>[A-Z0-9]{3})"
-            r".*$",
-            re.IGNORECASE
-        ),
-
-        # CNL CM 0100 PTY MIA 1234567 15JAN25 20JAN25
-        "CNL": re.compile(
-            r"^CNL\s+"
-            r"(?P<airline>[A-Z0-9]{2,3})\s+"
-            r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
-            r"(?P<origin>[A-Z]{3})\s+"
-            r"(?P<destination>[A-Z]{3})\s+"
-            r"(?P<operating_days>[1-7X]{7})\s+"
-            r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
-            r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})"
-            r".*$",
-            re.IGNORECASE
-        ),
-
-        # CON CM 0100 PTY MIA 1234567 22JAN25 25JAN25
-        "CON": re.compile(
-            r"^CON\s+"
-            r"(?P<airline>[A-Z0-9]{2,3})\s+"
-            r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
-            r"(?P<origin>[A-Z]{3})\s+"
-            r"(?P<destination>[A-Z]{3})\s+"
-            r"(?P<operating_days>[1-7X]{7})\s+"
-            r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
-            r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})"
-            r".*$",
-            re.IGNORECASE
-        ),
-
-        # SKD CM PTY 1DEC24 31MAR25
-        "SKD": re.compile(
-            r"^SKD\s+"
-            r"(?P<airline>[A-Z0-9]{2,3})\s+"
-            r"(?P<airport>[A-Z]{3})\s+"
-            r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
-            r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})"
-            r".*$",
-            re.IGNORECASE
-        ),
-
-        # RPL CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 738 0715 0945
-        "RPL": re.compile(
-            r"^RPL\s+"
-            r"(?P<airline>[A-Z0-9]{2,3})\s+"
-            r"(?P<flight_number>\d{1,4}[A-Z]?)\s+"
-            r"(?P<service_type>[JFCH])\s+"
-            r"(?P<origin>[A-Z]{3})\s+"
-            r"(?P<destination>[A-Z]{3})\s+"
-            r"(?P<operating_days>[1-7X]{7})\s+"
-            r"(?P<effective_from>\d{1,2}[A-Z]{3}\d{2})\s+"
-            r"(?P<effective_to>\d{1,2}[A-Z]{3}\d{2})\s+"
-            r"(?P<aircraft_type>[A-Z0-9]{3})\s+"
-            r"(?P<departure_time>\d{4})\s+"
-            r"(?P<arrival_time>\d{4})"
-            r".*$",
-            re.IGNORECASE
-        )
-    }
+    # SSM Format regex patterns (shared, stateless)
+    PATTERNS = _FIELD_RE
+
+    def __init__(self):
+        # One handler per message type, built once per parser
+        self._handlers: Dict[str, Callable[[str], Dict[str, Any]]] = {
+            message_type: self._make_handler(message_type, pattern)
+            for message_type, pattern in _FIELD_RE.items()
+        }
 
     def parse(self, message: str, message_type: str) -> Dict[str, Any]:
         """
@@ -150,27 +209,74 @@ class SSMParser:
         Raises:
             ValueError: If message format is invalid
         """
-        if message_type not in self.PATTERNS:
+        # Dispatch straight to the handler for this message type
+        handler = self._handlers.get(message_type)
+        if handler is None:
             raise ValueError(f"Unsupported message type: {message_type}")
 
-        # Get pattern for message type
-        pattern = self.PATTERNS[message_type]
-
-        # Match pattern
-        match = pattern.match(message.strip())
-
-        if not match:
-            raise ValueError(
-                f"Message does not match {message_type} format: {message[:100]}"
-            )
-
-        # Extract matched groups
-        data = match.groupdict()
+        return handler(message.strip())
 
-        # Post-process fields
-        data = self._post_process(data, message_type)
+    def _make_handler(
+        self,
+        message_type: str,
+        pattern: re.Pattern
+    ) -> Callable[[str], Dict[str, Any]]:
+        """
+        Build the parse function for one message type around its regex
 
-        return data
+        The pattern's groups decide once which post-processing steps apply,
+        so the handler runs only those steps instead of probing the match
+        for every optional field. Required groups are never empty when the
+        pattern matches. The output is the same as _post_process.
+        """
+        match_message = pattern.match
+        fields = pattern.groupindex
+        has_from = "effective_from" in fields
+        has_to = "effective_to" in fields
+        has_days = "operating_days" in fields
+        has_times = "departure_time" in fields and "arrival_time" in fields
+        parse_date = self._parse_ssm_date
+        day_offset = self._day_offset
+
+        def handler(message: str) -> Dict[str, Any]:
+            match = match_message(message)
+
+            if not match:
+                raise ValueError(
+                    f"Message does not match {message_type} format: {message[:100]}"
+                )
+
+            data = match.groupdict()
+
+            if has_from:
+                data["effective_from_date"] = parse_date(data["effective_from"])
+            if has_to:
+                data["effective_to_date"] = parse_date(data["effective_to"])
+
+            if has_days:
+                mask = _operating_days_mask(data["operating_days"])
+                data["operating_days_mask"] = mask
+                data["operating_days_array"] = list(_OPDAY_DECODE[mask])
+
+            if has_times:
+                dep_hour, dep_minute = divmod(int(data["departure_time"]), 100)
+                arr_hour, arr_minute = divmod(int(data["arrival_time"]), 100)
+                dep_minutes = dep_hour * 60 + dep_minute
+                arr_minutes = arr_hour * 60 + arr_minute
+                data["departure_hour"] = dep_hour
+                data["departure_minute"] = dep_minute
+                data["departure_minutes"] = dep_minutes
+                data["arrival_hour"] = arr_hour
+                data["arrival_minute"] = arr_minute
+                data["arrival_minutes"] = arr_minutes
+                data["arrival_day_offset"] = day_offset(
+                    dep_minutes, arr_minutes, data.get("day_change")
+                )
+
+            data["confidence"] = 1.0
+            return data
+
+        return handler
 
     def _post_process(self, data: Dict[str, Any], message_type: str) -> Dict[str, Any]:
         """
@@ -190,24 +296,32 @@ class SSMParser:
 
         # Parse operating days
         if "operating_days" in data and data["operating_days"]:
-            data["operating_days_array"] = self._parse_operating_days(
-                data["operating_days"]
-            )
+            mask = _operating_days_mask(data["operating_days"])
+            data["operating_days_mask"] = mask
+            data["operating_days_array"] = list(_OPDAY_DECODE[mask])
 
-        # Parse times
+        # Parse times (HHMM) once; minutes past midnight are kept for the
+        # day offset and the validator's departure/arrival check
+        dep_minutes = arr_minutes = None
         if "departure_time" in data and data["departure_time"]:
-            data["departure_hour"] = int(data["departure_time"][:2])
-            data["departure_minute"] = int(data["departure_time"][2:])
+            hour, minute = divmod(int(data["departure_time"]), 100)
+            dep_minutes = hour * 60 + minute
+            data["departure_hour"] = hour
+            data["departure_minute"] = minute
+            data["departure_minutes"] = dep_minutes
 
         if "arrival_time" in data and data["arrival_time"]:
-            data["arrival_hour"] = int(data["arrival_time"][:2])
-            data["arrival_minute"] = int(data["arrival_time"][2:])
+            hour, minute = divmod(int(data["arrival_time"]), 100)
+            arr_minutes = hour * 60 + minute
+            data["arrival_hour"] = hour
+            data["arrival_minute"] = minute
+            data["arrival_minutes"] = arr_minutes
 
         # Calculate day offset
-        if "departure_time" in data and "arrival_time" in data:
-            data["arrival_day_offset"] = self._calculate_day_offset(
-                data.get("departure_time"),
-                data.get("arrival_time"),
+        if dep_minutes is not None and arr_minutes is not None:
+            data["arrival_day_offset"] = self._day_offset(
+                dep_minutes,
+                arr_minutes,
                 data.get("day_change")
             )
 
@@ -216,21 +330,37 @@ class SSMParser:
 
         return data
 
-    def _parse_ssm_date(self, date_str: str) -> datetime:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_ssm_date(date_str: str) -> datetime:
         """
         Parse SSM date format (DDMMMYY)
 
         Examples:
         - 1DEC24 → December 1, 2024
         - 31MAR25 → March 31, 2025
+
+        Decoded by slicing and a month table instead of strptime; two-digit
+        years keep strptime's %y pivot (69-99 -> 19xx, 00-68 -> 20xx).
+        Batches repeat the same effective dates, so results are memoized.
         """
         # Format: DDMMMYY (e.g., 1DEC24, 31MAR25)
+        day = date_str[:-5]
         try:
-            return datetime.strptime(date_str.upper(), "%d%b%y")
-        except ValueError:
+            if not (len(day) <= 2 and day.isdigit() and date_str[-2:].isdigit()):
+                raise ValueError(date_str)
+            month = _MONTHS[date_str[-5:-2].upper()]
+            year = int(date_str[-2:])
+            return datetime(
+                year + (1900 if year >= 69 else 2000),
+                month,
+                int(day)
+            )
+        except (KeyError, ValueError):
             raise ValueError(f"Invalid SSM date format: {date_str}")
 
-    def _parse_operating_days(self, pattern: str) -> List[int]:
+    @staticmethod
+    def _parse_operating_days(pattern: str) -> List[int]:
         """
         Parse operating days pattern
 
@@ -239,20 +369,10 @@ class SSMParser:
 
         Where: 1=Monday, 2=Tuesday, ..., 7=Sunday, X=Not operating
         """
-        if len(pattern) != 7:
-            raise ValueError(f"Invalid operating days pattern: {pattern}")
-
-        operating_days = []
-        for i, char in enumerate(pattern, start=1):
-            if char == str(i):
-                operating_days.append(i)
-            elif char.upper() != 'X':
-                raise ValueError(f"Invalid character in operating days: {char}")
-
-        return operating_days
+        return list(_OPDAY_DECODE[_operating_days_mask(pattern)])
 
+    @staticmethod
     def _calculate_day_offset(
-        self,
         departure: str,
         arrival: str,
         day_change: Optional[str] = None
@@ -263,23 +383,24 @@ class SSMParser:
         If arrival time < departure time, flight arrives next day (+1)
         Can be explicitly specified in day_change field (E0, E+1, E+2)
         """
+        return SSMParser._day_offset(
+            int(departure[:2]) * 60 + int(departure[2:]),
+            int(arrival[:2]) * 60 + int(arrival[2:]),
+            day_change
+        )
+
+    @staticmethod
+    def _day_offset(
+        departure_minutes: int,
+        arrival_minutes: int,
+        day_change: Optional[str] = None
+    ) -> int:
+        """Calculate arrival day offset from minutes past midnight"""
         if day_change:
-            # Parse explicit day change (E0, E+1, E+2, E-1)
-            if day_change.startswith('E'):
-                offset_str = day_change[1:]
-                if offset_str in ['0', '+0']:
-                    return 0
-                elif offset_str.startswith('+'):
-                    return int(offset_str[1:])
-                elif offset_str.startswith('-'):
-                    return -int(offset_str[1:])
-            return 0
+            return _DAY_CHANGE_LUT.get(day_change, 0)
 
         # Auto-calculate based on times
-        dep_minutes = int(departure[:2]) * 60 + int(departure[2:])
-        arr_minutes = int(arrival[:2]) * 60 + int(arrival[2:])
-
-        if arr_minutes < dep_minutes:
+        if arrival_minutes < departure_minutes:
             return 1  # Arrives next day
         else:
             return 0  # Same day
@@ -292,24 +413,56 @@ class SSMParser:
         or additional information
         """
         lines = message.strip().split('\n')
-        results = []
+        return [
+            parsed for parsed in map(self._parse_line, lines)
+            if parsed is not None
+        ]
+
+    def parse_batch(
+        self,
+        lines: Iterable[str],
+        executor: Optional[Executor] = None,
+        chunksize: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse many SSM lines, optionally across worker processes
+
+        Results match parse_multi_line: one entry per line with a known
+        message type, either the parsed data or an error record. With an
+        executor (e.g. a ProcessPoolExecutor owned by the application),
+        lines are shipped to the workers in chunks of ``chunksize``.
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        Args:
+            lines: SSM message lines
+            executor: Optional executor to parse in; parses inline if None
+            chunksize: Lines per task sent to a worker
 
-            # Detect message type from line
-            first_word = line.split()[0].upper()
-            if first_word in self.PATTERNS:
-                try:
-                    parsed = self.parse(line, first_word)
-                    results.append(parsed)
-                except ValueError as e:
-                    # Skip invalid lines
-                    results.append({"error": str(e), "raw_line": line})
+        Returns:
+            Parsed data dictionaries, in input order
+        """
+        if executor is None:
+            parsed_lines = map(self._parse_line, lines)
+        else:
+            parsed_lines = executor.map(_parse_one, lines, chunksize=chunksize)
 
-        return results
+        return [parsed for parsed in parsed_lines if parsed is not None]
+
+    def _parse_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """Parse one line; None if it is blank or not an SSM message"""
+        line = line.strip()
+        if not line:
+            return None
+
+        # Detect message type from line; only the first word is split off
+        handler = self._handlers.get(line.split(None, 1)[0].upper())
+        if handler is None:
+            return None
+
+        try:
+            return handler(line)
+        except ValueError as e:
+            # Keep invalid lines as error records
+            return {"error": str(e), "raw_line": line}
 
     def extract_additional_fields(self, message: str) -> Dict[str, Any]:
         """
@@ -324,15 +477,31 @@ class SSMParser:
         """
         additional = {}
 
-        # Meal service codes (B, M, S, L, etc.)
-        meal_match = re.search(r'\s+([BMSLRNVKODFC])\s+', message)
-        if meal_match:
-            additional["meal_service"] = meal_match.group(1)
-
-        # Secure flight (JP, etc.)
-        secure_match = re.search(r'\s+([A-Z]{2})\s*$', message)
-        if secure_match:
-            additional["secure_flight"] = secure_match.group(1)
+        # One split serves both fields; a token counts only when whitespace
+        # separates it from the rest of the message
+        tokens = message.split()
+        if not tokens:
+            return additional
+
+        first = 0 if message[0].isspace() else 1
+        last = len(tokens) if message[-1].isspace() else len(tokens) - 1
+
+        # Meal service codes (B, M, S, L, etc.): first standalone code
+        for token in tokens[first:last]:
+            if len(token) == 1 and token in _MEAL_SERVICE_CHARS:
+                additional["meal_service"] = token
+                break
+
+        # Secure flight (JP, etc.): two capital letters ending the message
+        secure = tokens[-1]
+        if (
+            len(tokens) > first
+            and len(secure) == 2
+            and secure.isascii()
+            and secure.isalpha()
+            and secure.isupper()
+        ):
+            additional["secure_flight"] = secure
 
         return additional
 
@@ -367,3 +536,13 @@ DAY_CHANGE_CODES = {
     "E+2": "Arrival two days later (+2)",
     "E-1": "Arrival previous day (-1)"
 }
+
+
+# Parser used by parse_batch worker processes; SSMParser holds no
+# per-message state, so each process builds one at import
+_WORKER_PARSER = SSMParser()
+
+
+def _parse_one(line: str) -> Optional[Dict[str, Any]]:
+    """Parse one SSM line in a worker process (module-level, so picklable)"""
+    return _WORKER_PARSER._parse_line(line)
@@ -3,11 +3,39 @@ Record Transformer
 Transforms parsed SSM/SSIM data into database schema format
 """
 
-import uuid
-from datetime import datetime, time
+import os
+from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any, List
 
 
+@lru_cache(maxsize=4096)
+def _hhmmss(hour: int, minute: int) -> str:
+    """
+    Format a schedule time as HH:MM:SS
+
+    A season uses a few hundred distinct times at most, so results are
+    memoized. Out-of-range values raise ValueError, as time() would.
+    """
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        raise ValueError(f"Invalid schedule time: {hour}:{minute}")
+    return f"{hour:02d}:{minute:02d}:00"
+
+
+def _uuid4_str() -> str:
+    """
+    Random (version 4) UUID in canonical hyphenated form
+
+    Equivalent to str(uuid.uuid4()) without building the UUID object;
+    records only ever carry the string form.
+    """
+    b = bytearray(os.urandom(16))
+    b[6] = b[6] & 0x0F | 0x40  # version 4
+    b[8] = b[8] & 0x3F | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
 class RecordTransformer:
     """Transform parsed messages to database records"""
 
@@ -45,7 +73,8 @@ class RecordTransformer:
         message_id: str
     ) -> List[Dict[str, Any]]:
         """Transform NEW message to flight record"""
-        flight_id = str(uuid.uuid4())
+        flight_id = _uuid4_str()
+        days_mask = data.get("operating_days_mask")
 
         # Main flight record
         flight_record = {
@@ -56,21 +85,18 @@ class RecordTransformer:
             "service_type": data.get("service_type", "J"),
             "origin_airport": data["origin"],
             "destination_airport": data["destination"],
-            "departure_time": time(
-                hour=data["departure_hour"],
-                minute=data["departure_minute"]
-            ).strftime("%H:%M:%S"),
-            "arrival_time": time(
-                hour=data["arrival_hour"],
-                minute=data["arrival_minute"]
-            ).strftime("%H:%M:%S"),
+            "departure_time": _hhmmss(data["departure_hour"], data["departure_minute"]),
+            "arrival_time": _hhmmss(data["arrival_hour"], data["arrival_minute"]),
             "departure_day_offset": 0,
             "arrival_day_offset": data.get("arrival_day_offset", 0),
             "operating_days": data["operating_days"],
             "effective_from": data["effective_from_date"].date(),
             "effective_to": data["effective_to_date"].date(),
             "aircraft_type": data.get("aircraft_type"),
-            "frequency_per_week": len(data.get("operating_days_array", [])),
+            "frequency_per_week": (
+                days_mask.bit_count() if days_mask is not None
+                else len(data.get("operating_days_array", []))
+            ),
             "meal_service": data.get("meal_service"),
             "secure_flight_required": data.get("secure_flight") is not None,
             "metadata": {
@@ -86,19 +112,13 @@ class RecordTransformer:
             for idx, leg in enumerate(data["continuation_legs"], start=2):
                 leg_record = {
                     "record_type": "flight_leg",
-                    "leg_id": str(uuid.uuid4()),
+                    "leg_id": _uuid4_str(),
                     "flight_id": flight_id,
                     "leg_sequence": idx,
                     "departure_airport": leg["origin"],
                     "arrival_airport": leg["destination"],
-                    "departure_time": time(
-                        hour=leg["departure_hour"],
-                        minute=leg["departure_minute"]
-                    ).strftime("%H:%M:%S"),
-                    "arrival_time": time(
-                        hour=leg["arrival_hour"],
-                        minute=leg["arrival_minute"]
-                    ).strftime("%H:%M:%S"),
+                    "departure_time": _hhmmss(leg["departure_hour"], leg["departure_minute"]),
+                    "arrival_time": _hhmmss(leg["arrival_hour"], leg["arrival_minute"]),
                     "departure_day_offset": 0,
                     "arrival_day_offset": leg.get("arrival_day_offset", 0),
                     "aircraft_type": leg.get("aircraft_type")
@@ -123,14 +143,8 @@ class RecordTransformer:
             "effective_from": data["effective_from_date"].date(),
             "effective_to": data["effective_to_date"].date(),
             "operating_days": data["operating_days"],
-            "new_departure_time": time(
-                hour=data["departure_hour"],
-                minute=data["departure_minute"]
-            ).strftime("%H:%M:%S"),
-            "new_arrival_time": time(
-                hour=data["arrival_hour"],
-                minute=data["arrival_minute"]
-            ).strftime("%H:%M:%S"),
+            "new_departure_time": _hhmmss(data["departure_hour"], data["departure_minute"]),
+            "new_arrival_time": _hhmmss(data["arrival_hour"], data["arrival_minute"]),
             "metadata": {"ssm_message_id": message_id}
         }]
 
@@ -4,49 +4,153 @@ Validates parsed SSM/SSIM messages against IATA standards
 """
 
 import re
+import time
+import logging
+import threading
 from datetime import datetime, date
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+logger = logging.getLogger(__name__)
 
 
 # IATA airport codes (sample - in production, query from database)
-VALID_AIRPORTS = {
+VALID_AIRPORTS = frozenset({
     "PTY", "MIA", "JFK", "LAX", "ATL", "ORD", "DFW", "DEN", "SFO", "SEA",
     "LAS", "PHX", "IAH", "MCO", "EWR", "MSP", "DTW", "BOS", "PHL", "LGA",
     "FLL", "BWI", "DCA", "SLC", "SAN", "TPA", "PDX", "STL", "HNL", "AUS",
     "LHR", "CDG", "FRA", "AMS", "MAD", "BCN", "FCO", "MXP", "ZRH", "VIE",
     "GRU", "EZE", "BOG", "LIM", "SCL", "MEX", "CUN", "GDL", "MTY"
-}
+})
 
 # IATA airline codes (sample)
-VALID_AIRLINES = {
+VALID_AIRLINES = frozenset({
     "CM", "AA", "DL", "UA", "WN", "B6", "AS", "NK", "F9", "G4",
     "BA", "AF", "LH", "KL", "IB", "AZ", "LX", "OS", "TP", "SK"
-}
+})
 
 # IATA aircraft types (sample)
-VALID_AIRCRAFT = {
+VALID_AIRCRAFT = frozenset({
     "738", "73J", "73H", "737", "73G", "73W", "7M8", "7M9",
     "320", "321", "319", "318", "32A", "32B", "32N", "32Q",
     "77W", "77L", "777", "788", "789", "781", "380", "359", "350"
+})
+
+# Code format checks, compiled once at import
+_AIRLINE_CODE_RE = re.compile(r"[A-Z0-9]{2,3}")
+_AIRPORT_CODE_RE = re.compile(r"[A-Z]{3}")
+_AIRCRAFT_TYPE_RE = re.compile(r"[A-Z0-9]{3}")
+_FLIGHT_NUMBER_RE = re.compile(r"\d{1,4}[A-Z]?")
+
+# Characters allowed in a 7-character operating days pattern
+_OPERATING_DAY_CHARS = frozenset("1234567Xx")
+
+# SSM service type codes (passenger, cargo, combi, charter)
+_SERVICE_TYPE_CODES = frozenset({"J", "F", "C", "H"})
+
+# Required fields for every message type
+_COMMON_REQUIRED = ("airline", "flight_number")
+
+# Type-specific required fields
+_TYPE_REQUIRED: Dict[str, Tuple[str, ...]] = {
+    "NEW": ("service_type", "origin", "destination", "operating_days",
+            "effective_from", "effective_to", "aircraft_type",
+            "departure_time", "arrival_time"),
+    "TIM": ("origin", "destination", "operating_days",
+            "effective_from", "effective_to", "departure_time", "arrival_time"),
+    "EQT": ("origin", "destination", "operating_days",
+            "effective_from", "effective_to", "aircraft_type"),
+    "CNL": ("origin", "destination", "operating_days",
+            "effective_from", "effective_to"),
+    "CON": ("origin", "destination", "operating_days",
+            "effective_from", "effective_to"),
+    "SKD": ("airport", "effective_from", "effective_to")
+}
+
+# Full required field list per type, concatenated once at import
+_REQUIRED_FIELDS: Dict[str, Tuple[str, ...]] = {
+    message_type: _COMMON_REQUIRED + fields
+    for message_type, fields in _TYPE_REQUIRED.items()
 }
 
+# Reference data is loaded in one round trip and refreshed at most this often
+REFERENCE_REFRESH_SECONDS = 3600
+
+# Until a load succeeds, validate() retries it at most this often
+REFERENCE_RETRY_SECONDS = 30
+
+REFERENCE_CODES_QUERY = """
+    SELECT 'airport', airport_code FROM airport_constraints
+    UNION
+    SELECT 'aircraft', aircraft_type FROM aircraft_availability
+    UNION
+    SELECT 'airline', operating_airline FROM aircraft_availability
+    WHERE operating_airline IS NOT NULL
+    UNION
+    SELECT 'airline', owner_airline FROM aircraft_availability
+    WHERE owner_airline IS NOT NULL
+"""
+
 
 class MessageValidator:
     """Validator for SSM/SSIM parsed messages"""
 
-    def __init__(self, db_connection=None):
+    def __init__(self, db_connection=None, connection_pool=None):
         """
         Initialize validator
 
         Args:
             db_connection: Optional database connection for reference data
+            connection_pool: Optional psycopg2 ThreadedConnectionPool; when
+                given, a connection is only checked out while reference data
+                loads, so a long-lived validator holds none in between
         """
         self.db = db_connection
+        self.pool = connection_pool
+
+        # Known codes as frozensets; membership checks do no I/O
+        self._airlines = frozenset(VALID_AIRLINES)
+        self._airports = frozenset(VALID_AIRPORTS)
+        self._aircraft = frozenset(VALID_AIRCRAFT)
+        self._reference_loaded_at = None
+        self._reference_retry_at = None
+
+        # Shared validators are called from many threads; one refreshes
+        self._refresh_lock = threading.Lock()
+
+        self.refresh_reference_data()
+
+    def refresh_reference_data(self):
+        """
+        Bulk-load airline, airport and aircraft codes from the database
+
+        Codes found in the constraint and fleet tables are added to the
+        built-in IATA samples. Without a connection, or if the load fails,
+        the current sets are kept and validate() retries the load every
+        REFERENCE_RETRY_SECONDS until it succeeds.
+        """
+        if self.db is None and self.pool is None:
+            return
+
+        try:
+            codes = self._load_reference_codes()
+        except Exception as e:
+            logger.warning(f"Reference data load failed, using cached codes: {e}")
+            self._reference_retry_at = time.monotonic() + REFERENCE_RETRY_SECONDS
+            return
+
+        self._airlines = frozenset(VALID_AIRLINES | codes["airline"])
+        self._airports = frozenset(VALID_AIRPORTS | codes["airport"])
+        self._aircraft = frozenset(VALID_AIRCRAFT | codes["aircraft"])
+        self._reference_loaded_at = time.monotonic()
+        self._reference_retry_at = None
 
     def validate(
         self,
         parsed_data: Dict[str, Any],
-        message_type: str
+        message_type: str,
+        today: Optional[date] = None
     ) -> Dict[str, Any]:
         """
         Validate parsed message data
@@ -54,29 +158,73 @@ class MessageValidator:
         Args:
             parsed_data: Parsed message data
             message_type: Message type (NEW, TIM, etc.)
+            today: Reference date for past/future checks; batch callers
+                pass one value for every message. Defaults to today.
 
         Returns:
             Validation result with errors and warnings
         """
+        self._refresh_if_stale()
+        return self._validate(parsed_data, message_type, today)
+
+    def _load_reference_codes(self) -> Dict[str, set]:
+        """Query reference codes by kind on a pooled or the given connection"""
+        conn = self.pool.getconn() if self.pool is not None else self.db
+
+        # A read on the caller's connection only ends the transaction it
+        # opened itself, never one holding someone else's work
+        owns_transaction = (
+            self.pool is not None
+            or conn.get_transaction_status() == TRANSACTION_STATUS_IDLE
+        )
+
+        codes = {"airline": set(), "airport": set(), "aircraft": set()}
+        cursor = conn.cursor()
+        try:
+            cursor.execute(REFERENCE_CODES_QUERY)
+            for kind, code in cursor.fetchall():
+                codes[kind].add(code)
+        finally:
+            cursor.close()
+            if owns_transaction:
+                conn.rollback()
+            if self.pool is not None:
+                self.pool.putconn(conn)
+
+        return codes
+
+    def _refresh_if_stale(self):
+        """Refresh reference codes once they go stale, or retry a failed load"""
+        now = time.monotonic()
+        if self._reference_retry_at is not None:
+            due = now >= self._reference_retry_at
+        else:
+            due = (
+                self._reference_loaded_at is not None
+                and now - self._reference_loaded_at > REFERENCE_REFRESH_SECONDS
+            )
+
+        if due and self._refresh_lock.acquire(blocking=False):
+            try:
+                self.refresh_reference_data()
+            finally:
+                self._refresh_lock.release()
+
+    def _validate(
+        self,
+        parsed_data: Dict[str, Any],
+        message_type: str,
+        today: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """Validate one message against the current reference codes"""
         errors = []
         warnings = []
 
         # Required field validation
-        required_errors = self._validate_required_fields(parsed_data, message_type)
-        errors.extend(required_errors)
-
-        # Data format validation
-        format_errors = self._validate_data_formats(parsed_data)
-        errors.extend(format_errors)
-
-        # Business logic validation
-        logic_errors, logic_warnings = self._validate_business_logic(parsed_data)
-        errors.extend(logic_errors)
-        warnings.extend(logic_warnings)
+        self._validate_required_fields(parsed_data, message_type, errors)
 
-        # Cross-field validation
-        cross_errors = self._validate_cross_fields(parsed_data)
-        errors.extend(cross_errors)
+        # Formats, business rules and cross-field rules in one pass
+        self._validate_fields(parsed_data, errors, warnings, today)
 
         return {
             "is_valid": len(errors) == 0,
@@ -87,172 +235,171 @@ class MessageValidator:
     def _validate_required_fields(
         self,
         data: Dict[str, Any],
-        message_type: str
-    ) -> List[str]:
+        message_type: str,
+        errors: List[str]
+    ):
         """Validate required fields by message type"""
-        errors = []
-
-        # Common required fields
-        common_required = ["airline", "flight_number"]
-
-        # Type-specific required fields
-        type_required = {
-            "NEW": ["service_type", "origin", "destination", "operating_days",
-                    "effective_from", "effective_to", "aircraft_type",
-                    "departure_time", "arrival_time"],
-            "TIM": ["origin", "destination", "operating_days",
-                    "effective_from", "effective_to", "departure_time", "arrival_time"],
-            "EQT": ["origin", "destination", "operating_days",
-                    "effective_from", "effective_to", "aircraft_type"],
-            "CNL": ["origin", "destination", "operating_days",
-                    "effective_from", "effective_to"],
-            "CON": ["origin", "destination", "operating_days",
-                    "effective_from", "effective_to"],
-            "SKD": ["airport", "effective_from", "effective_to"]
-        }
-
-        required_fields = common_required + type_required.get(message_type, [])
-
-        for field in required_fields:
-            if field not in data or data[field] is None or data[field] == "":
+        get = data.get
+        for field in _REQUIRED_FIELDS.get(message_type, _COMMON_REQUIRED):
+            value = get(field)
+            if value is None or value == "":
                 errors.append(f"Missing required field: {field}")
 
-        return errors
+    def _validate_fields(
+        self,
+        data: Dict[str, Any],
+        errors: List[str],
+        warnings: List[str],
+        today: Optional[date] = None
+    ):
+        """
+        Validate field values in a single pass over the parsed data
 
-    def _validate_data_formats(self, data: Dict[str, Any]) -> List[str]:
-        """Validate data formats (codes, patterns, etc.)"""
-        errors = []
+        Each field is read once; errors and warnings are appended in order:
+        data formats, business logic, then cross-field rules.
+        """
+        get = data.get
+        airline = get("airline")
+        origin = get("origin")
+        destination = get("destination")
+        aircraft_type = get("aircraft_type")
+        flight_number = get("flight_number")
+        operating_days = get("operating_days")
+        service_type = get("service_type")
+        departure_time = get("departure_time")
+        arrival_time = get("arrival_time")
 
         # Validate airline code
-        if "airline" in data and data["airline"]:
-            if not re.match(r"^[A-Z0-9]{2,3}$", data["airline"]):
-                errors.append(f"Invalid airline code format: {data['airline']}")
-            # Check against known airlines (in production, query database)
-            if data["airline"] not in VALID_AIRLINES:
-                errors.append(f"Unknown airline code: {data['airline']}")
+        if airline:
+            if not _AIRLINE_CODE_RE.fullmatch(airline):
+                errors.append(f"Invalid airline code format: {airline}")
+            # Check against known airlines
+            if airline not in self._airlines:
+                errors.append(f"Unknown airline code: {airline}")
 
         # Validate airport codes
-        for field in ["origin", "destination", "airport"]:
-            if field in data and data[field]:
-                if not re.match(r"^[A-Z]{3}$", data[field]):
-                    errors.append(f"Invalid {field} code format: {data[field]}")
-                if data[field] not in VALID_AIRPORTS:
-                    errors.append(f"Unknown {field} code: {data[field]}")
+        for field, code in (
+            ("origin", origin),
+            ("destination", destination),
+            ("airport", get("airport"))
+        ):
+            if code:
+                if not _AIRPORT_CODE_RE.fullmatch(code):
+                    errors.append(f"Invalid {field} code format: {code}")
+                if code not in self._airports:
+                    errors.append(f"Unknown {field} code: {code}")
 
         # Validate aircraft type
-        if "aircraft_type" in data and data["aircraft_type"]:
-            if not re.match(r"^[A-Z0-9]{3}$", data["aircraft_type"]):
-                errors.append(f"Invalid aircraft type format: {data['aircraft_type']}")
-            if data["aircraft_type"] not in VALID_AIRCRAFT:
-                errors.append(f"Unknown aircraft type: {data['aircraft_type']}")
+        if aircraft_type:
+            if not _AIRCRAFT_TYPE_RE.fullmatch(aircraft_type):
+                errors.append(f"Invalid aircraft type format: {aircraft_type}")
+            if aircraft_type not in self._aircraft:
+                errors.append(f"Unknown aircraft type: {aircraft_type}")
 
         # Validate flight number
-        if "flight_number" in data and data["flight_number"]:
-            if not re.match(r"^\d{1,4}[A-Z]?$", data["flight_number"]):
-                errors.append(f"Invalid flight number format: {data['flight_number']}")
+        if flight_number and not _FLIGHT_NUMBER_RE.fullmatch(flight_number):
+            errors.append(f"Invalid flight number format: {flight_number}")
 
         # Validate operating days
-        if "operating_days" in data and data["operating_days"]:
-            if not re.match(r"^[1-7X]{7}$", data["operating_days"], re.IGNORECASE):
-                errors.append(f"Invalid operating days pattern: {data['operating_days']}")
+        if operating_days and (
+            len(operating_days) != 7
+            or not _OPERATING_DAY_CHARS.issuperset(operating_days)
+        ):
+            errors.append(f"Invalid operating days pattern: {operating_days}")
 
         # Validate service type
-        if "service_type" in data and data["service_type"]:
-            if data["service_type"] not in ["J", "F", "C", "H"]:
-                errors.append(f"Invalid service type: {data['service_type']}")
+        if service_type and service_type not in _SERVICE_TYPE_CODES:
+            errors.append(f"Invalid service type: {service_type}")
 
         # Validate times (HHMM format)
-        for time_field in ["departure_time", "arrival_time"]:
-            if time_field in data and data[time_field]:
-                if not re.match(r"^\d{4}$", data[time_field]):
-                    errors.append(f"Invalid {time_field} format: {data[time_field]}")
-                else:
-                    hour = int(data[time_field][:2])
-                    minute = int(data[time_field][2:])
-                    if hour > 23 or minute > 59:
-                        errors.append(f"Invalid {time_field}: {data[time_field]}")
-
-        return errors
-
-    def _validate_business_logic(
-        self,
-        data: Dict[str, Any]
-    ) -> tuple[List[str], List[str]]:
-        """Validate business logic rules"""
-        errors = []
-        warnings = []
+        for time_field, value in (
+            ("departure_time", departure_time),
+            ("arrival_time", arrival_time)
+        ):
+            if value:
+                if len(value) != 4 or not value.isdecimal():
+                    errors.append(f"Invalid {time_field} format: {value}")
+                elif int(value[:2]) > 23 or int(value[2:]) > 59:
+                    errors.append(f"Invalid {time_field}: {value}")
 
         # Validate date range
-        if "effective_from_date" in data and "effective_to_date" in data:
-            if data["effective_from_date"] and data["effective_to_date"]:
-                if data["effective_from_date"] > data["effective_to_date"]:
-                    errors.append(
-                        f"effective_from ({data['effective_from']}) must be before "
-                        f"effective_to ({data['effective_to']})"
-                    )
-
-                # Check if dates are in the past
+        from_date = get("effective_from_date")
+        to_date = get("effective_to_date")
+        if from_date and to_date:
+            if from_date > to_date:
+                errors.append(
+                    f"effective_from ({data['effective_from']}) must be before "
+                    f"effective_to ({data['effective_to']})"
+                )
+
+            # Check if dates are in the past
+            if today is None:
                 today = datetime.now().date()
-                if data["effective_to_date"].date() < today:
-                    warnings.append("Schedule effective_to date is in the past")
+            if to_date.date() < today:
+                warnings.append("Schedule effective_to date is in the past")
 
-                # Check if date range is reasonable (not too far in future)
-                days_ahead = (data["effective_from_date"].date() - today).days
-                if days_ahead > 365:
-                    warnings.append("Schedule starts more than 1 year in the future")
+            # Check if date range is reasonable (not too far in future)
+            days_ahead = (from_date.date() - today).days
+            if days_ahead > 365:
+                warnings.append("Schedule starts more than 1 year in the future")
 
         # Validate origin != destination
-        if "origin" in data and "destination" in data:
-            if data["origin"] == data["destination"]:
-                errors.append("Origin and destination airports must be different")
+        if "origin" in data and "destination" in data and origin == destination:
+            errors.append("Origin and destination airports must be different")
 
         # Validate operating days (at least one day must be active)
-        if "operating_days_array" in data:
-            if not data["operating_days_array"]:
-                errors.append("At least one operating day must be selected")
-
-        return errors, warnings
-
-    def _validate_cross_fields(self, data: Dict[str, Any]) -> List[str]:
-        """Validate cross-field relationships"""
-        errors = []
+        if "operating_days_array" in data and not data["operating_days_array"]:
+            errors.append("At least one operating day must be selected")
 
         # Validate departure vs arrival times
-        if "departure_time" in data and "arrival_time" in data:
-            if data["departure_time"] and data["arrival_time"]:
-                dep_hour = data.get("departure_hour")
-                dep_min = data.get("departure_minute")
-                arr_hour = data.get("arrival_hour")
-                arr_min = data.get("arrival_minute")
+        if departure_time and arrival_time:
+            # Parsers store minutes past midnight; other sources may only
+            # carry hours and minutes
+            dep_minutes = get("departure_minutes")
+            arr_minutes = get("arrival_minutes")
+            if dep_minutes is None or arr_minutes is None:
+                dep_hour = get("departure_hour")
+                dep_min = get("departure_minute")
+                arr_hour = get("arrival_hour")
+                arr_min = get("arrival_minute")
 
                 if all(v is not None for v in [dep_hour, dep_min, arr_hour, arr_min]):
                     dep_minutes = dep_hour * 60 + dep_min
                     arr_minutes = arr_hour * 60 + arr_min
 
-                    # If same day (day_offset = 0) and arrival < departure
-                    day_offset = data.get("arrival_day_offset", 0)
-                    if day_offset == 0 and arr_minutes <= dep_minutes:
-                        errors.append(
-                            "Arrival time must be after departure time for same-day flights"
-                        )
-
-        return errors
+            # If same day (day_offset = 0) and arrival < departure
+            if (
+                dep_minutes is not None
+                and arr_minutes is not None
+                and get("arrival_day_offset", 0) == 0
+                and arr_minutes <= dep_minutes
+            ):
+                errors.append(
+                    "Arrival time must be after departure time for same-day flights"
+                )
 
     def validate_batch(
         self,
         messages: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
-        """Validate multiple messages"""
-        results = []
+        """
+        Validate multiple messages
 
-        for msg in messages:
-            result = self.validate(
-                msg.get("parsed_data", {}),
-                msg.get("message_type", "")
-            )
-            results.append({
-                "message_id": msg.get("message_id"),
-                **result
-            })
+        Reference codes and today's date are resolved once per batch
+        rather than once per message.
+        """
+        self._refresh_if_stale()
+        validate = self._validate
+        today = datetime.now().date()
 
-        return results
+        return [
+            {
+                "message_id": msg.get("message_id"),
+                **validate(
+                    msg.get("parsed_data", {}),
+                    msg.get("message_type", ""),
+                    today
+                )
+            }
+            for msg in messages
+        ]
@@ -0,0 +1,58 @@
+"""
+HTTP Caching Helpers
+ETag / If-None-Match support for endpoints polled by dashboards
+"""
+
+import hashlib
+from fastapi import Request, Response
+
+
+# Polling clients may reuse a response this long before revalidating
+CACHE_CONTROL = "private, max-age=5"
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the values that identify a response version
+
+    Args:
+        parts: Version values (IDs, status, timestamps, counts, ...)
+
+    Returns:
+        Quoted ETag header value
+    """
+    key = ":".join(map(str, parts)).encode()
+    return f'"{hashlib.blake2b(key, digest_size=16).hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check whether the client's If-None-Match already covers etag
+
+    Tags are compared weakly, as If-None-Match requires: proxies that
+    compress responses hand clients W/"..." versions of our strong tags.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return etag in (
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for an unchanged resource"""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+def set_cache_headers(response: Response, etag: str):
+    """Attach ETag and Cache-Control headers to a full response"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
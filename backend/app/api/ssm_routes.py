@@ -3,16 +3,63 @@ FastAPI Routes for SSM/SSIM Message Processing
 Endpoints for ingesting and processing airline schedule messages
 """
 
+import asyncio
+import logging
+import os
+import threading
+
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 
 from ..agents.ssm_parser.agent import SSMParserAgent
-from ..database import get_db_connection, get_neo4j_driver
-
+from ..agents.ssm_parser.validators.message_validator import MessageValidator
+from ..database import (
+    get_db_connection,
+    get_db_pool,
+    get_neo4j_driver,
+    release_db_connection
+)
+
+logger = logging.getLogger(__name__)
+
+# Validator shared by all requests; reference codes load once and refresh
+# on the validator's own schedule
+_validator: Optional[MessageValidator] = None
+
+# Handlers run in the threadpool; only one builds the shared validator
+_validator_lock = threading.Lock()
+
+# Agent shared by all requests; it reads and saves through the pool, one
+# pooled connection per operation, so it is bound to none
+_agent: Optional[SSMParserAgent] = None
+_agent_lock = threading.Lock()
+
+# Maximum age of the ssm_stats_24h materialized view served by /statistics
+STATISTICS_REFRESH_SECONDS = 60
+
+SSM_STATISTICS_QUERY = """
+    SELECT
+        total_messages,
+        successful,
+        failed,
+        rejected,
+        avg_processing_ms,
+        message_type_distribution,
+        refreshed_at < NOW() - make_interval(secs => %s) AS stale
+    FROM ssm_stats_24h
+"""
 
-router = APIRouter(prefix="/api/schedules/ssm", tags=["SSM Processing"])
+# Responses are encoded with orjson rather than the stdlib json module
+# Endpoints that only make blocking psycopg2 calls are plain `def`, so
+# FastAPI runs them in its threadpool instead of stalling the event loop
+router = APIRouter(
+    prefix="/api/schedules/ssm",
+    tags=["SSM Processing"],
+    default_response_class=ORJSONResponse
+)
 
 
 # ============================================================================
@@ -38,6 +85,10 @@ class SSMBatchInput(BaseModel):
     """Batch SSM messages input"""
     messages: List[str] = Field(..., description="List of raw SSM messages")
     batch_size: int = Field(100, description="Batch processing size", ge=1, le=1000)
+    background: bool = Field(
+        False,
+        description="Accept the batch (202) and process it after responding"
+    )
 
 
 class SSMProcessingResponse(BaseModel):
@@ -68,16 +119,64 @@ class SSMBatchResponse(BaseModel):
 # DEPENDENCY INJECTION
 # ============================================================================
 
-def get_ssm_agent():
-    """Get SSM Parser Agent instance"""
-    db = get_db_connection()
-    neo4j = get_neo4j_driver()
+def get_message_validator() -> MessageValidator:
+    """Get the shared SSM message validator"""
+    global _validator
 
-    return SSMParserAgent(
-        db_connection=db,
-        neo4j_driver=neo4j,
-        use_llm_fallback=True
-    )
+    if _validator is None:
+        with _validator_lock:
+            if _validator is None:
+                # Borrows a pooled connection only while reference data loads
+                _validator = MessageValidator(connection_pool=get_db_pool())
+
+    return _validator
+
+
+def get_db():
+    """Get a pooled database connection for the request"""
+    conn = get_db_connection()
+    try:
+        yield conn
+    finally:
+        release_db_connection(conn)
+
+
+def get_ssm_agent(
+    validator: MessageValidator = Depends(get_message_validator)
+) -> SSMParserAgent:
+    """Get the shared SSM Parser Agent"""
+    global _agent
+
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                _agent = SSMParserAgent(
+                    db_connection=None,
+                    neo4j_driver=get_neo4j_driver(),
+                    use_llm_fallback=True,
+                    checkpoint_db=os.getenv("SSM_CHECKPOINT_DB"),
+                    db_pool=get_db_pool(),
+                    validator=validator
+                )
+
+    return _agent
+
+
+def _process_batch_shard(messages: List[str]):
+    """Process one shard of a background batch after the response"""
+    try:
+        result = get_ssm_agent(get_message_validator()).process_batch(
+            messages,
+            batch_size=len(messages)
+        )
+
+        logger.info(
+            f"Background batch shard done: {result['successful']} successful, "
+            f"{result['failed']} failed, {result['rejected']} rejected"
+        )
+
+    except Exception as e:
+        logger.error(f"Background batch shard failed: {e}", exc_info=True)
 
 
 # ============================================================================
@@ -113,7 +212,10 @@ async def ingest_ssm_message(
     - Processing result with status and flight IDs
     """
     try:
-        result = agent.process(
+        # The pipeline blocks on the LLM and database; keep it off the
+        # event loop so other requests are served meanwhile
+        result = await asyncio.to_thread(
+            agent.process,
             input_data.message,
             sender_airline=input_data.sender_airline,
             receiver_airline=input_data.receiver_airline
@@ -151,11 +253,33 @@ async def ingest_ssm_batch(
     }
     ```
 
+    With `"background": true` the batch is accepted right away (202) and
+    processed after the response, one `batch_size` shard at a time; the
+    outcome of each message is then available from `/messages` and
+    `/statistics`.
+
     **Returns:**
     - Batch processing results with success/failure counts
     """
     try:
-        result = agent.process_batch(
+        if input_data.background:
+            messages = input_data.messages
+            batch_size = input_data.batch_size
+
+            for i in range(0, len(messages), batch_size):
+                background_tasks.add_task(
+                    _process_batch_shard, messages[i:i + batch_size]
+                )
+
+            return ORJSONResponse(
+                status_code=202,
+                content={"status": "accepted", "total": len(messages)}
+            )
+
+        # The pipeline blocks on the LLM and database; keep it off the
+        # event loop so other requests are served meanwhile
+        result = await asyncio.to_thread(
+            agent.process_batch,
             input_data.messages,
             batch_size=input_data.batch_size
         )
@@ -174,14 +298,13 @@ async def ingest_ssm_batch(
 
 
 @router.get("/messages/{message_id}")
-async def get_ssm_message_status(message_id: str):
+def get_ssm_message_status(message_id: str, db=Depends(get_db)):
     """
     Get processing status of an SSM message
 
     **Returns:**
     - Message details, processing status, and affected flights
     """
-    db = get_db_connection()
     cursor = db.cursor()
 
     try:
@@ -214,8 +337,8 @@ async def get_ssm_message_status(message_id: str):
             "processing_status": result[3],
             "validation_errors": result[4],
             "affected_flight_ids": result[5],
-            "received_at": result[6].isoformat() if result[6] else None,
-            "processed_at": result[7].isoformat() if result[7] else None
+            "received_at": result[6],
+            "processed_at": result[7]
         }
 
     finally:
@@ -223,7 +346,7 @@ async def get_ssm_message_status(message_id: str):
 
 
 @router.post("/messages/{message_id}/reprocess")
-async def reprocess_failed_message(
+def reprocess_failed_message(
     message_id: str,
     agent: SSMParserAgent = Depends(get_ssm_agent)
 ):
@@ -238,34 +361,16 @@ async def reprocess_failed_message(
     **Returns:**
     - New processing result
     """
-    db = get_db_connection()
-    cursor = db.cursor()
-
-    try:
-        # Get original message
-        cursor.execute(
-            "SELECT raw_message, sender_airline FROM ssm_messages WHERE message_id = %s",
-            (message_id,)
-        )
-
-        result = cursor.fetchone()
-
-        if not result:
-            raise HTTPException(status_code=404, detail="Message not found")
+    result = agent.process_by_id(message_id)
 
-        raw_message, sender_airline = result
+    if result is None:
+        raise HTTPException(status_code=404, detail="Message not found")
 
-        # Reprocess
-        result = agent.process(raw_message, sender_airline=sender_airline)
-
-        return SSMProcessingResponse(**result)
-
-    finally:
-        cursor.close()
+    return SSMProcessingResponse(**result)
 
 
 @router.get("/statistics")
-async def get_ssm_statistics():
+def get_ssm_statistics(db=Depends(get_db)):
     """
     Get SSM processing statistics
 
@@ -274,41 +379,23 @@ async def get_ssm_statistics():
     - Success/failure rates
     - Processing times
     - Message type distribution
+
+    Served from the ssm_stats_24h materialized view, which is refreshed
+    here once it is older than STATISTICS_REFRESH_SECONDS.
     """
-    db = get_db_connection()
     cursor = db.cursor()
 
     try:
-        # Overall statistics
-        cursor.execute(
-            """
-            SELECT
-                COUNT(*) as total_messages,
-                COUNT(*) FILTER (WHERE processing_status = 'completed') as successful,
-                COUNT(*) FILTER (WHERE processing_status = 'failed') as failed,
-                COUNT(*) FILTER (WHERE processing_status = 'rejected') as rejected,
-                AVG(EXTRACT(EPOCH FROM (processed_at - received_at)) * 1000)::INT as avg_processing_ms
-            FROM ssm_messages
-            WHERE received_at >= NOW() - INTERVAL '24 hours'
-            """
-        )
-
+        cursor.execute(SSM_STATISTICS_QUERY, (STATISTICS_REFRESH_SECONDS,))
         stats = cursor.fetchone()
 
-        # Message type distribution
-        cursor.execute(
-            """
-            SELECT
-                message_type,
-                COUNT(*) as count
-            FROM ssm_messages
-            WHERE received_at >= NOW() - INTERVAL '24 hours'
-            GROUP BY message_type
-            ORDER BY count DESC
-            """
-        )
+        if stats[6]:
+            # REFRESH ... CONCURRENTLY keeps the view readable meanwhile
+            cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY ssm_stats_24h")
+            db.commit()
 
-        type_distribution = {row[0]: row[1] for row in cursor.fetchall()}
+            cursor.execute(SSM_STATISTICS_QUERY, (STATISTICS_REFRESH_SECONDS,))
+            stats = cursor.fetchone()
 
         return {
             "last_24_hours": {
@@ -318,7 +405,7 @@ async def get_ssm_statistics():
                 "rejected": stats[3],
                 "avg_processing_time_ms": stats[4]
             },
-            "message_type_distribution": type_distribution
+            "message_type_distribution": stats[5]
         }
 
     finally:
@@ -326,13 +413,12 @@ async def get_ssm_statistics():
 
 
 @router.delete("/messages/{message_id}")
-async def delete_ssm_message(message_id: str):
+def delete_ssm_message(message_id: str, db=Depends(get_db)):
     """
     Delete an SSM message record
 
     **Warning:** This is a destructive operation
     """
-    db = get_db_connection()
     cursor = db.cursor()
 
     try:
@@ -2,20 +2,87 @@
 Schedule Validation API Routes
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterator, List, Dict, Any
+import asyncio
 import logging
-import os
-import psycopg2
+import threading
+import orjson
+from collections import Counter
+from contextlib import contextmanager
+from cachetools import TTLCache
+from psycopg2.extras import Json, execute_values
 from dotenv import load_dotenv
 
 from ..agents.schedule_validation import ScheduleValidationAgent
+from ..database import get_db_connection, get_db_pool, release_db_connection
+from .http_cache import is_not_modified, make_etag, not_modified, set_cache_headers
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/schedules/validation", tags=["validation"])
+# Responses are encoded with orjson rather than the stdlib json module
+# Endpoints that only make blocking psycopg2 calls are plain `def`, so
+# FastAPI runs them in its threadpool instead of stalling the event loop
+router = APIRouter(
+    prefix="/api/schedules/validation",
+    tags=["validation"],
+    default_response_class=ORJSONResponse
+)
+
+# Validation results for repeat reads (/results, /report), keyed by
+# schedule and its version so edits to the schedule or its flights miss the
+# cache; the TTL bounds staleness from reference data changes
+VALIDATION_CACHE_TTL_SECONDS = 300
+VALIDATION_CACHE_MAX_ENTRIES = 256
+
+_validation_cache = TTLCache(
+    maxsize=VALIDATION_CACHE_MAX_ENTRIES,
+    ttl=VALIDATION_CACHE_TTL_SECONDS
+)
+
+# Handlers run in the threadpool and cachetools caches are not thread-safe
+_validation_cache_lock = threading.Lock()
+
+# Changes whenever the schedule row or any of its flights is written
+SCHEDULE_VERSION_QUERY = """
+    SELECT s.version_number, s.updated_at,
+           COUNT(f.flight_id), MAX(f.updated_at)
+    FROM schedules s
+    LEFT JOIN flights f ON f.schedule_id = s.schedule_id
+    WHERE s.schedule_id = %s
+    GROUP BY s.schedule_id
+"""
+
+# Idle validation agents. Each request (or bulk validation thread) borrows
+# one and binds it to its pooled connection, so compiled agents outlive the
+# connections the pool closes and are never shared between borrowers
+_idle_agents: List[ScheduleValidationAgent] = []
+_idle_agents_lock = threading.Lock()
+
+# Latest issues per schedule, replaced on every validation run
+DELETE_ISSUES_QUERY = "DELETE FROM schedule_validation_issues WHERE schedule_id = %s"
+
+INSERT_ISSUES_QUERY = """
+    INSERT INTO schedule_validation_issues (
+        schedule_id, issue_index, severity, category, issue_type,
+        flight_id, flight_number, description, recommended_action,
+        impact, details
+    ) VALUES %s
+"""
+
+# Changes whenever a validation run rewrites the schedule's issues
+ISSUES_VERSION_QUERY = """
+    SELECT COUNT(*), MAX(validated_at)
+    FROM schedule_validation_issues
+    WHERE schedule_id = %s
+"""
+
+# Maximum schedules validated at once by /bulk-validate (bounds the number
+# of pooled connections a single request can hold)
+BULK_VALIDATION_CONCURRENCY = 8
 
 
 # Request/Response Models
@@ -25,7 +92,7 @@ class ValidationRequest(BaseModel):
     airline_code: Optional[str] = Field(None, description="Airline code")
     validation_options: Optional[Dict[str, Any]] = Field(
         default_factory=dict,
-        description="Validation options"
+        description="Validation options (fail_fast, critical_threshold)"
     )
 
 
@@ -64,21 +131,135 @@ class ValidationReportRequest(BaseModel):
 
 # Dependency: Database connection
 def get_db():
-    """Get database connection"""
+    """Get a pooled database connection for the request"""
+    conn = get_db_connection()
     try:
-        conn = psycopg2.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            database=os.getenv("DB_NAME", "airline_scheduling"),
-            user=os.getenv("DB_USER", "postgres"),
-            password=os.getenv("DB_PASSWORD", "")
-        )
         yield conn
     finally:
-        conn.close()
+        release_db_connection(conn)
+
+
+def _dumps(obj: Any) -> str:
+    """orjson-backed JSON encoder for persisted issue details"""
+    return orjson.dumps(obj, default=str).decode()
+
+
+@contextmanager
+def _get_agent(db) -> Iterator[ScheduleValidationAgent]:
+    """Borrow a validation agent bound to a pooled connection"""
+    with _idle_agents_lock:
+        agent = _idle_agents.pop() if _idle_agents else None
+
+    if agent is None:
+        agent = ScheduleValidationAgent(
+            db_connection=db,
+            llm_model="claude-sonnet-4-20250514"
+        )
+    else:
+        agent.use_connection(db)
+
+    try:
+        yield agent
+    finally:
+        # The connection goes back to the pool; idle agents hold none
+        agent.use_connection(None)
+        with _idle_agents_lock:
+            _idle_agents.append(agent)
+
+
+def _schedule_version(db, schedule_id: str) -> Optional[tuple]:
+    """Get the cache version of a schedule (None if it does not exist)"""
+    cursor = db.cursor()
+    try:
+        cursor.execute(SCHEDULE_VERSION_QUERY, (schedule_id,))
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+def _is_complete(result: Dict[str, Any]) -> bool:
+    """Whether a validation run checked every category"""
+    return "error" not in result and not result.get(
+        "summary", {}
+    ).get("skipped_categories")
+
+
+def _all_issues(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten a validation result's per-category issue lists"""
+    return [
+        {"category": category, **issue}
+        for category, issues in result.get("validation_results", {}).items()
+        for issue in issues
+    ]
+
+
+def _store_issues(db, schedule_id: str, result: Dict[str, Any]):
+    """
+    Replace the schedule's persisted issues with those of a validation run
+
+    Failed and fail-fast runs (no or partial issue list) leave the
+    previous issues in place.
+    """
+    if not _is_complete(result):
+        return
+
+    rows = [
+        (
+            schedule_id,
+            index,
+            issue.get("severity"),
+            issue.get("category"),
+            issue.get("issue_type"),
+            issue.get("flight_id"),
+            issue.get("flight_number"),
+            issue.get("description"),
+            issue.get("recommended_action"),
+            issue.get("impact"),
+            Json(issue, dumps=_dumps)
+        )
+        for index, issue in enumerate(_all_issues(result))
+    ]
+
+    cursor = db.cursor()
+    try:
+        cursor.execute(DELETE_ISSUES_QUERY, (schedule_id,))
+        if rows:
+            execute_values(cursor, INSERT_ISSUES_QUERY, rows, page_size=1000)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def _save_validation(db, schedule_id: str, result: Dict[str, Any]):
+    """Persist a fresh validation result's issues and cache it for reads"""
+    if not _is_complete(result):
+        return
+
+    _store_issues(db, schedule_id, result)
+    key = (schedule_id, _schedule_version(db, schedule_id))
+    with _validation_cache_lock:
+        _validation_cache[key] = result
+
+
+def _get_validation_result(db, schedule_id: str) -> Dict[str, Any]:
+    """Get cached validation results, running validation on a miss"""
+    key = (schedule_id, _schedule_version(db, schedule_id))
+
+    with _validation_cache_lock:
+        result = _validation_cache.get(key)
+    if result is None:
+        with _get_agent(db) as agent:
+            result = agent.validate(schedule_id=schedule_id)
+        _save_validation(db, schedule_id, result)
+
+    return result
 
 
 @router.post("/validate", response_model=ValidationResponse)
-async def validate_schedule(
+def validate_schedule(
     request: ValidationRequest,
     db=Depends(get_db)
 ):
@@ -100,24 +281,21 @@ async def validate_schedule(
     try:
         logger.info(f"Starting validation for schedule {request.schedule_id}")
 
-        # Initialize agent
-        agent = ScheduleValidationAgent(
-            db_connection=db,
-            llm_model="claude-sonnet-4-20250514"
-        )
-
         # Run validation
-        result = agent.validate(
-            schedule_id=request.schedule_id,
-            options=request.validation_options
-        )
+        with _get_agent(db) as agent:
+            result = agent.validate(
+                schedule_id=request.schedule_id,
+                options=request.validation_options
+            )
+        _save_validation(db, request.schedule_id, result)
 
         # Extract statistics
-        issues = result.get("all_issues", [])
-        critical = len([i for i in issues if i.get("severity") == "critical"])
-        high = len([i for i in issues if i.get("severity") == "high"])
-        medium = len([i for i in issues if i.get("severity") == "medium"])
-        low = len([i for i in issues if i.get("severity") == "low"])
+        issues = _all_issues(result)
+        severities = Counter(i.get("severity") for i in issues)
+        critical = severities["critical"]
+        high = severities["high"]
+        medium = severities["medium"]
+        low = severities["low"]
 
         # Determine status
         if critical > 0:
@@ -149,21 +327,31 @@ async def validate_schedule(
 
 
 @router.get("/results/{schedule_id}", response_model=Dict[str, Any])
-async def get_validation_results(
+def get_validation_results(
     schedule_id: str,
+    request: Request,
+    response: Response,
     db=Depends(get_db)
 ):
     """
     Get detailed validation results for a schedule
 
     Returns all validation issues, analysis, and recommendations.
+    Responses carry an ETag per validation run; pollers sending it back
+    in If-None-Match get 304 Not Modified until the schedule is revalidated.
     """
     try:
-        # Initialize agent
-        agent = ScheduleValidationAgent(db_connection=db)
-
         # Get cached results (if available) or run validation
-        result = agent.validate(schedule_id=schedule_id)
+        result = _get_validation_result(db, schedule_id)
+
+        # A new run (schedule edit, cache expiry) has a new timestamp;
+        # failed runs carry none and are never cached by clients
+        validated_at = result.get("validated_at")
+        if validated_at:
+            etag = make_etag(schedule_id, validated_at)
+            if is_not_modified(request, etag):
+                return not_modified(etag)
+            set_cache_headers(response, etag)
 
         return result
 
@@ -173,8 +361,10 @@ async def get_validation_results(
 
 
 @router.get("/issues/{schedule_id}", response_model=List[ValidationIssue])
-async def get_validation_issues(
+def get_validation_issues(
     schedule_id: str,
+    request: Request,
+    response: Response,
     severity: Optional[str] = None,
     category: Optional[str] = None,
     limit: int = 100,
@@ -189,25 +379,49 @@ async def get_validation_issues(
     - category: Filter by category (slot_validation, aircraft_validation, etc.)
     - limit: Maximum number of issues to return
     - offset: Number of issues to skip (for pagination)
+
+    Issues are read from the schedule's latest validation run. Responses
+    carry an ETag; pollers sending it back in If-None-Match get 304 Not
+    Modified until the schedule is revalidated.
     """
     try:
-        # Get validation results
-        agent = ScheduleValidationAgent(db_connection=db)
-        result = agent.validate(schedule_id=schedule_id)
-
-        issues = result.get("all_issues", [])
-
-        # Apply filters
-        if severity:
-            issues = [i for i in issues if i.get("severity") == severity]
-
-        if category:
-            issues = [i for i in issues if i.get("category") == category]
-
-        # Apply pagination
-        paginated_issues = issues[offset:offset + limit]
-
-        return paginated_issues
+        cursor = db.cursor()
+
+        try:
+            # Each run rewrites the schedule's issues with one timestamp
+            cursor.execute(ISSUES_VERSION_QUERY, (schedule_id,))
+            etag = make_etag(
+                schedule_id, *cursor.fetchone(), severity, category, limit, offset
+            )
+            if is_not_modified(request, etag):
+                return not_modified(etag)
+
+            # Filter and paginate in SQL
+            query = """
+                SELECT details
+                FROM schedule_validation_issues
+                WHERE schedule_id = %s
+            """
+            params = [schedule_id]
+
+            if severity:
+                query += " AND severity = %s"
+                params.append(severity)
+
+            if category:
+                query += " AND category = %s"
+                params.append(category)
+
+            query += " ORDER BY issue_index LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
+
+            cursor.execute(query, params)
+            issues = [row[0] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+        set_cache_headers(response, etag)
+        return issues
 
     except Exception as e:
         logger.error(f"Error retrieving issues: {e}", exc_info=True)
@@ -215,7 +429,7 @@ async def get_validation_issues(
 
 
 @router.post("/report", response_model=Dict[str, str])
-async def generate_validation_report(
+def generate_validation_report(
     request: ValidationReportRequest,
     db=Depends(get_db)
 ):
@@ -230,8 +444,7 @@ async def generate_validation_report(
     """
     try:
         # Get validation results
-        agent = ScheduleValidationAgent(db_connection=db)
-        result = agent.validate(schedule_id=request.schedule_id)
+        result = _get_validation_result(db, request.schedule_id)
 
         # Generate report
         from ..agents.schedule_validation.report_generator import ReportGenerator
@@ -250,147 +463,201 @@ async def generate_validation_report(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Validation categories never change at runtime, so the response body is
+# serialized once and served with long-lived cache headers
+VALIDATION_CATEGORIES = [
+    {
+        "id": "slot_validation",
+        "name": "Airport Slot Validation",
+        "description": "Validates airport slot allocations per IATA WSG",
+        "checks": [
+            "Slot exists at coordinated airports",
+            "Slot time matches scheduled time",
+            "Slot is confirmed",
+            "Historical rights are maintained"
+        ]
+    },
+    {
+        "id": "aircraft_validation",
+        "name": "Aircraft Availability Validation",
+        "description": "Validates aircraft availability and routing",
+        "checks": [
+            "Aircraft exists and is active",
+            "Aircraft type matches requirements",
+            "No maintenance conflicts",
+            "Sufficient turnaround time",
+            "Routing continuity"
+        ]
+    },
+    {
+        "id": "crew_validation",
+        "name": "Crew Feasibility Validation",
+        "description": "Validates crew availability and compliance",
+        "checks": [
+            "Minimum crew complement",
+            "Aircraft type ratings",
+            "Flight duty period limits",
+            "Rest requirements",
+            "Monthly/yearly hour limits"
+        ]
+    },
+    {
+        "id": "mct_validation",
+        "name": "Minimum Connect Time Validation",
+        "description": "Validates passenger connection times",
+        "checks": [
+            "Connection time meets MCT",
+            "Terminal change time",
+            "Immigration/customs time",
+            "Baggage re-check time"
+        ]
+    },
+    {
+        "id": "curfew_validation",
+        "name": "Airport Curfew Validation",
+        "description": "Validates airport operating hours and curfews",
+        "checks": [
+            "Airport operating hours",
+            "Noise curfew restrictions",
+            "Night movement limits",
+            "Noise category requirements"
+        ]
+    },
+    {
+        "id": "regulatory_validation",
+        "name": "Regulatory Compliance Validation",
+        "description": "Validates aviation regulatory requirements",
+        "checks": [
+            "Traffic rights (freedoms of air)",
+            "Bilateral agreements",
+            "Cabotage restrictions",
+            "Designated carrier status"
+        ]
+    },
+    {
+        "id": "routing_validation",
+        "name": "Aircraft Routing Validation",
+        "description": "Validates aircraft routing efficiency",
+        "checks": [
+            "Routing continuity",
+            "Aircraft range limitations",
+            "Hub connectivity",
+            "Positioning efficiency"
+        ]
+    },
+    {
+        "id": "pattern_validation",
+        "name": "Schedule Pattern Validation",
+        "description": "Validates schedule patterns and consistency",
+        "checks": [
+            "Operating days format",
+            "Frequency consistency",
+            "Equipment consistency",
+            "Schedule symmetry"
+        ]
+    }
+]
+
+_CATEGORIES_BODY = orjson.dumps({"categories": VALIDATION_CATEGORIES})
+_CATEGORIES_ETAG = make_etag(_CATEGORIES_BODY)
+_CATEGORIES_HEADERS = {
+    "ETag": _CATEGORIES_ETAG,
+    "Cache-Control": "public, max-age=86400"
+}
+
+
 @router.get("/categories")
-async def get_validation_categories():
+async def get_validation_categories(request: Request):
     """
     Get list of all validation categories
 
     Returns information about each validation category including
     what it checks and potential issues.
     """
-    return {
-        "categories": [
-            {
-                "id": "slot_validation",
-                "name": "Airport Slot Validation",
-                "description": "Validates airport slot allocations per IATA WSG",
-                "checks": [
-                    "Slot exists at coordinated airports",
-                    "Slot time matches scheduled time",
-                    "Slot is confirmed",
-                    "Historical rights are maintained"
-                ]
-            },
-            {
-                "id": "aircraft_validation",
-                "name": "Aircraft Availability Validation",
-                "description": "Validates aircraft availability and routing",
-                "checks": [
-                    "Aircraft exists and is active",
-                    "Aircraft type matches requirements",
-                    "No maintenance conflicts",
-                    "Sufficient turnaround time",
-                    "Routing continuity"
-                ]
-            },
-            {
-                "id": "crew_validation",
-                "name": "Crew Feasibility Validation",
-                "description": "Validates crew availability and compliance",
-                "checks": [
-                    "Minimum crew complement",
-                    "Aircraft type ratings",
-                    "Flight duty period limits",
-                    "Rest requirements",
-                    "Monthly/yearly hour limits"
-                ]
-            },
-            {
-                "id": "mct_validation",
-                "name": "Minimum Connect Time Validation",
-                "description": "Validates passenger connection times",
-                "checks": [
-                    "Connection time meets MCT",
-                    "Terminal change time",
-                    "Immigration/customs time",
-                    "Baggage re-check time"
-                ]
-            },
-            {
-                "id": "curfew_validation",
-                "name": "Airport Curfew Validation",
-                "description": "Validates airport operating hours and curfews",
-                "checks": [
-                    "Airport operating hours",
-                    "Noise curfew restrictions",
-                    "Night movement limits",
-                    "Noise category requirements"
-                ]
-            },
-            {
-                "id": "regulatory_validation",
-                "name": "Regulatory Compliance Validation",
-                "description": "Validates aviation regulatory requirements",
-                "checks": [
-                    "Traffic rights (freedoms of air)",
-                    "Bilateral agreements",
-                    "Cabotage restrictions",
-                    "Designated carrier status"
-                ]
-            },
-            {
-                "id": "routing_validation",
-                "name": "Aircraft Routing Validation",
-                "description": "Validates aircraft routing efficiency",
-                "checks": [
-                    "Routing continuity",
-                    "Aircraft range limitations",
-                    "Hub connectivity",
-                    "Positioning efficiency"
-                ]
-            },
-            {
-                "id": "pattern_validation",
-                "name": "Schedule Pattern Validation",
-                "description": "Validates schedule patterns and consistency",
-                "checks": [
-                    "Operating days format",
-                    "Frequency consistency",
-                    "Equipment consistency",
-                    "Schedule symmetry"
-                ]
-            }
-        ]
-    }
+    if is_not_modified(request, _CATEGORIES_ETAG):
+        return Response(status_code=304, headers=_CATEGORIES_HEADERS)
+
+    return Response(
+        content=_CATEGORIES_BODY,
+        media_type="application/json",
+        headers=_CATEGORIES_HEADERS
+    )
 
 
 @router.post("/bulk-validate")
-async def bulk_validate_schedules(
-    schedule_ids: List[str],
-    db=Depends(get_db)
-):
+async def bulk_validate_schedules(schedule_ids: List[str]):
     """
     Validate multiple schedules in batch
 
     Useful for validating all schedules for a season or airline.
-    """
-    try:
-        results = []
+    Schedules are validated concurrently in worker threads, each on its
+    own pooled connection (psycopg2 connections must not be shared
+    across threads).
 
-        for schedule_id in schedule_ids:
-            try:
-                agent = ScheduleValidationAgent(db_connection=db)
-                result = agent.validate(schedule_id=schedule_id)
-
-                issues = result.get("all_issues", [])
-                critical = len([i for i in issues if i.get("severity") == "critical"])
+    Results are streamed as NDJSON, one line per schedule in completion
+    order, so clients can act on the first result without waiting for
+    the slowest schedule.
+    """
+    pool = get_db_pool()
+    semaphore = asyncio.Semaphore(BULK_VALIDATION_CONCURRENCY)
+
+    def _validate(schedule_id: str) -> Dict[str, Any]:
+        conn = pool.getconn()
+        try:
+            # Only pass/fail is reported, so stop at the first critical issue
+            with _get_agent(conn) as agent:
+                result = agent.validate(
+                    schedule_id=schedule_id,
+                    options={"fail_fast": True}
+                )
+            _store_issues(conn, schedule_id, result)
+            return result
+        finally:
+            pool.putconn(conn)
+
+    async def _run(schedule_id: str) -> Dict[str, Any]:
+        try:
+            async with semaphore:
+                result = await asyncio.to_thread(_validate, schedule_id)
+
+        except Exception as e:
+            logger.error(f"Bulk validation error for {schedule_id}: {e}", exc_info=True)
+            return {
+                "schedule_id": schedule_id,
+                "status": "error",
+                "error": str(e)
+            }
 
-                results.append({
-                    "schedule_id": schedule_id,
-                    "status": "failed" if critical > 0 else "passed",
-                    "total_issues": len(issues),
-                    "critical_issues": critical
-                })
+        # The agent reports load and validation failures in the result
+        if "error" in result:
+            return {
+                "schedule_id": schedule_id,
+                "status": "error",
+                "error": result["error"]
+            }
 
-            except Exception as e:
-                results.append({
-                    "schedule_id": schedule_id,
-                    "status": "error",
-                    "error": str(e)
-                })
+        issues = _all_issues(result)
+        critical = sum(1 for i in issues if i.get("severity") == "critical")
 
-        return {"results": results}
+        return {
+            "schedule_id": schedule_id,
+            "status": "failed" if critical > 0 else "passed",
+            "total_issues": len(issues),
+            "critical_issues": critical
+        }
 
-    except Exception as e:
-        logger.error(f"Bulk validation error: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+    async def _stream():
+        # Validate each schedule once; repeated IDs get a line per occurrence
+        occurrences = Counter(schedule_ids)
+
+        tasks = [asyncio.create_task(_run(schedule_id)) for schedule_id in occurrences]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                yield (orjson.dumps(result) + b"\n") * occurrences[result["schedule_id"]]
+        finally:
+            # Client went away: drop schedules still waiting for a slot
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
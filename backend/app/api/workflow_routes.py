@@ -3,22 +3,216 @@ Workflow API Routes
 Manage and monitor schedule update workflows
 """
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Request, Response, WebSocket
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import psycopg2
+from psycopg2 import sql
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+import asyncio
 import logging
-import os
-import psycopg2
+import threading
+import weakref
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
+from ..database import get_db_connection, open_listen_connection, release_db_connection
+from .http_cache import is_not_modified, make_etag, not_modified, set_cache_headers
 from ..workflows.schedule_update import WeeklyScheduleUpdateWorkflow, ScheduleUpdateState
 from ..workflows.schedule_update.scheduler import get_scheduler
+from ..workflows.schedule_update.workflow import progress_channel
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/schedules/workflows", tags=["workflows"])
+# Responses are encoded with orjson rather than the stdlib json module
+# Endpoints that only make blocking psycopg2 calls are plain `def`, so
+# FastAPI runs them in its threadpool instead of stalling the event loop
+router = APIRouter(
+    prefix="/api/schedules/workflows",
+    tags=["workflows"],
+    default_response_class=ORJSONResponse
+)
+
+# Agents of a schedule update workflow, in execution order
+WORKFLOW_AGENTS = (
+    "ssm_parser", "validator", "conflict_resolver",
+    "fleet_assignment", "crew_feasibility", "slot_compliance", "distribution"
+)
+
+# Progress streams end once the workflow reaches one of these
+TERMINAL_WORKFLOW_STATUSES = {"completed", "failed", "cancelled"}
+
+# Idle progress streams send a comment this often
+PROGRESS_KEEPALIVE_SECONDS = 15
+
+
+# Responses for dashboards that poll the same workflows. Running
+# workflows change as agents complete, so their entries live only briefly;
+# finished workflows no longer change and are kept much longer.
+RUNNING_WORKFLOW_CACHE_TTL_SECONDS = 2
+FINISHED_WORKFLOW_CACHE_TTL_SECONDS = 3600
+LIST_CACHE_TTL_SECONDS = 5
+WORKFLOW_CACHE_MAX_ENTRIES = 1024
+
+_running_cache = TTLCache(
+    maxsize=WORKFLOW_CACHE_MAX_ENTRIES,
+    ttl=RUNNING_WORKFLOW_CACHE_TTL_SECONDS
+)
+_finished_cache = TTLCache(
+    maxsize=WORKFLOW_CACHE_MAX_ENTRIES,
+    ttl=FINISHED_WORKFLOW_CACHE_TTL_SECONDS
+)
+_list_cache = TTLCache(maxsize=256, ttl=LIST_CACHE_TTL_SECONDS)
+
+# Handlers run in the threadpool and cachetools caches are not thread-safe
+_cache_lock = threading.Lock()
+
+# Hot read queries, prepared once per pooled connection and run with
+# EXECUTE so Postgres skips parsing and planning on every request
+PREPARED_STATEMENTS = {
+    "wf_list": """
+        SELECT w.workflow_id, w.schedule_season, w.status,
+               w.started_at, w.completed_at,
+               done.count,
+               COALESCE(recent.messages, '[]'::json) AS messages
+        FROM (
+            SELECT workflow_id, schedule_season, status,
+                   started_at, completed_at
+            FROM schedule_workflows
+            WHERE workflow_type = 'weekly_update'
+              AND (status = $1 OR $1 IS NULL)
+              AND (schedule_season = $2 OR $2 IS NULL)
+            ORDER BY started_at DESC
+            LIMIT $3 OFFSET $4
+        ) AS w
+        CROSS JOIN LATERAL (
+            SELECT COUNT(*) AS count
+            FROM agent_executions
+            WHERE workflow_id = w.workflow_id
+              AND status = 'completed'
+              AND agent_name <> 'supervisor'
+        ) AS done
+        CROSS JOIN LATERAL (
+            SELECT json_agg(
+                       json_build_object(
+                           'agent', e.agent_name,
+                           'status', e.status,
+                           'execution_time_ms', e.execution_time_ms,
+                           'summary', e.output_summary,
+                           'timestamp', e.executed_at
+                       )
+                       ORDER BY e.executed_at
+                   ) AS messages
+            FROM (
+                SELECT agent_name, status, execution_time_ms,
+                       output_summary, executed_at
+                FROM agent_executions
+                WHERE workflow_id = w.workflow_id
+                ORDER BY executed_at DESC
+                LIMIT 10
+            ) AS e
+        ) AS recent
+        ORDER BY w.started_at DESC
+    """,
+    "wf_get": """
+        SELECT workflow_id, schedule_season, status,
+               started_at, completed_at
+        FROM schedule_workflows
+        WHERE workflow_id = $1
+    """,
+    "wf_get_with_messages": """
+        SELECT w.workflow_id, w.schedule_season, w.status,
+               w.started_at, w.completed_at,
+               COALESCE(
+                   (
+                       SELECT json_agg(
+                           json_build_object(
+                               'agent', e.agent_name,
+                               'status', e.status,
+                               'execution_time_ms', e.execution_time_ms,
+                               'summary', e.output_summary,
+                               'timestamp', e.executed_at
+                           )
+                           ORDER BY e.executed_at
+                       )
+                       FROM agent_executions e
+                       WHERE e.workflow_id = w.workflow_id
+                   ),
+                   '[]'::json
+               ) AS messages
+        FROM schedule_workflows w
+        WHERE w.workflow_id = $1
+    """,
+    "wf_summary": """
+        SELECT w.workflow_id, w.schedule_season, w.status,
+               w.started_at, w.completed_at,
+               COALESCE((w.output_data->>'parsed_flights')::int, 0),
+               COALESCE((w.output_data->>'conflicts')::int, 0),
+               COALESCE((w.output_data->>'resolutions')::int, 0),
+               COALESCE((w.output_data->>'total_issues')::int, 0),
+               COALESCE((w.output_data->>'critical_issues')::int, 0),
+               COALESCE(
+                   (
+                       SELECT array_agg(e.agent_name ORDER BY e.executed_at)
+                       FROM agent_executions e
+                       WHERE e.workflow_id = w.workflow_id
+                         AND e.status = 'completed'
+                         AND e.agent_name <> 'supervisor'
+                   ),
+                   '{}'
+               ) AS agents_executed
+        FROM schedule_workflows w
+        WHERE w.workflow_id = $1
+    """,
+    "wf_status": """
+        SELECT status FROM schedule_workflows
+        WHERE workflow_id = $1
+    """,
+    "wf_progress": """
+        SELECT done.agents, latest.agent_name, latest.status
+        FROM (
+            SELECT COALESCE(
+                       array_agg(agent_name ORDER BY executed_at) FILTER (
+                           WHERE status = 'completed' AND agent_name <> 'supervisor'
+                       ),
+                       '{}'
+                   ) AS agents
+            FROM agent_executions
+            WHERE workflow_id = $1
+        ) AS done
+        LEFT JOIN LATERAL (
+            SELECT agent_name, status
+            FROM agent_executions
+            WHERE workflow_id = $1
+            ORDER BY executed_at DESC
+            LIMIT 1
+        ) AS latest ON TRUE
+    """,
+    "wf_recent_messages": """
+        SELECT agent_name, status, execution_time_ms,
+               output_summary, executed_at
+        FROM agent_executions
+        WHERE workflow_id = $1
+        ORDER BY executed_at DESC
+        LIMIT $2
+    """,
+    "wf_progress_version": """
+        SELECT w.status, log.count, log.latest
+        FROM schedule_workflows w
+        CROSS JOIN LATERAL (
+            SELECT COUNT(*) AS count, MAX(executed_at) AS latest
+            FROM agent_executions
+            WHERE workflow_id = w.workflow_id
+        ) AS log
+        WHERE w.workflow_id = $1
+    """
+}
+
+# Statements already prepared on each connection (prepared statements live
+# for the session, so pooled connections keep them between requests)
+_prepared_connections = weakref.WeakKeyDictionary()
 
 
 # ===================================================================
@@ -41,8 +235,8 @@ class WorkflowResponse(BaseModel):
     schedule_season: str
     airline_code: str
     status: str  # running, completed, failed
-    started_at: str
-    completed_at: Optional[str] = None
+    started_at: datetime
+    completed_at: Optional[datetime] = None
     progress_percent: int
     current_phase: str
     messages: List[Dict[str, Any]]
@@ -57,7 +251,7 @@ class WorkflowProgressResponse(BaseModel):
     current_agent: str
     completed_agents: List[str]
     pending_agents: List[str]
-    messages: List[Dict[str, Any]]
+    messages: List[Dict[str, Any]] = []
     estimated_completion_minutes: int
 
 
@@ -79,17 +273,12 @@ class WorkflowSummaryResponse(BaseModel):
 # ===================================================================
 
 def get_db():
-    """Get database connection"""
+    """Get a pooled database connection for the request"""
+    conn = get_db_connection()
     try:
-        conn = psycopg2.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            database=os.getenv("DB_NAME", "airline_scheduling"),
-            user=os.getenv("DB_USER", "postgres"),
-            password=os.getenv("DB_PASSWORD", "")
-        )
         yield conn
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 
 # ===================================================================
@@ -99,8 +288,7 @@ def get_db():
 @router.post("/start", response_model=Dict[str, str])
 async def start_workflow(
     request: WorkflowStartRequest,
-    background_tasks: BackgroundTasks,
-    db=Depends(get_db)
+    background_tasks: BackgroundTasks
 ):
     """
     Start a new schedule update workflow
@@ -116,7 +304,7 @@ async def start_workflow(
         logger.info(f"Starting workflow for season {request.schedule_season}")
 
         # Get scheduler
-        scheduler = get_scheduler(db)
+        scheduler = get_scheduler()
 
         # Start workflow asynchronously
         workflow_id = await scheduler.run_manual_update(
@@ -137,7 +325,7 @@ async def start_workflow(
 
 
 @router.get("/list", response_model=List[WorkflowResponse])
-async def list_workflows(
+def list_workflows(
     status: Optional[str] = None,
     season: Optional[str] = None,
     limit: int = 50,
@@ -153,54 +341,45 @@ async def list_workflows(
     - limit: Maximum results (default 50)
     - offset: Pagination offset
     """
+    list_key = (status, season, limit, offset)
+    with _cache_lock:
+        workflows = _list_cache.get(list_key)
+    if workflows is not None:
+        return workflows
+
     try:
         cursor = db.cursor()
 
-        # Build query
-        query = """
-            SELECT workflow_id, schedule_season, status,
-                   started_at, completed_at, output_data
-            FROM schedule_workflows
-            WHERE workflow_type = 'weekly_update'
-        """
-        params = []
-
-        if status:
-            query += " AND status = %s"
-            params.append(status)
-
-        if season:
-            query += " AND schedule_season = %s"
-            params.append(season)
-
-        query += " ORDER BY started_at DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
-
-        cursor.execute(query, params)
+        # Unset filters are passed as NULL, so one prepared plan serves
+        # every filter combination. Each workflow comes with its completed
+        # agent count and last 10 messages, all in one round trip
+        _execute_prepared(cursor, "wf_list", (status, season, limit, offset))
+        rows = cursor.fetchall()
 
         workflows = []
-        for row in cursor.fetchall():
-            workflow_id, schedule_season, wf_status, started_at, completed_at, output_data = row
-
-            # Get messages
-            messages = _get_workflow_messages(db, workflow_id)
+        for row in rows:
+            workflow_id, schedule_season, wf_status, started_at, completed_at, completed, messages = row
 
             # Calculate progress
-            progress = _calculate_progress(wf_status, messages)
+            progress = _calculate_progress(wf_status, completed)
 
             workflows.append(WorkflowResponse(
                 workflow_id=workflow_id,
                 schedule_season=schedule_season,
                 airline_code="CM",  # TODO: Get from workflow data
                 status=wf_status,
-                started_at=started_at.isoformat() if started_at else None,
-                completed_at=completed_at.isoformat() if completed_at else None,
+                started_at=started_at,
+                completed_at=completed_at,
                 progress_percent=progress["percent"],
                 current_phase=progress["phase"],
-                messages=messages[-10:]  # Last 10 messages
+                messages=messages
             ))
 
         cursor.close()
+
+        with _cache_lock:
+            _list_cache[list_key] = workflows
+
         return workflows
 
     except Exception as e:
@@ -209,49 +388,40 @@ async def list_workflows(
 
 
 @router.get("/{workflow_id}", response_model=WorkflowResponse)
-async def get_workflow(workflow_id: str, db=Depends(get_db)):
+def get_workflow(workflow_id: str, db=Depends(get_db)):
     """
     Get detailed workflow information
 
     Returns complete workflow state including all agent messages
     and execution details.
     """
-    try:
-        cursor = db.cursor()
-
-        cursor.execute("""
-            SELECT workflow_id, schedule_season, status,
-                   started_at, completed_at, output_data
-            FROM schedule_workflows
-            WHERE workflow_id = %s
-        """, (workflow_id,))
+    cached = _get_cached(("workflow", workflow_id))
+    if cached is not None:
+        return cached
 
-        row = cursor.fetchone()
+    try:
+        # Workflow and its messages in one round trip
+        row = _fetch_workflow_with_messages(db, workflow_id)
 
         if not row:
             raise HTTPException(status_code=404, detail="Workflow not found")
 
-        workflow_id, schedule_season, status, started_at, completed_at, output_data = row
-
-        # Get messages
-        messages = _get_workflow_messages(db, workflow_id)
+        workflow_id, schedule_season, status, started_at, completed_at, messages = row
 
         # Calculate progress
-        progress = _calculate_progress(status, messages)
+        progress = _calculate_progress(status, len(_completed_agents(messages)))
 
-        cursor.close()
-
-        return WorkflowResponse(
+        return _set_cached(("workflow", workflow_id), status, WorkflowResponse(
             workflow_id=workflow_id,
             schedule_season=schedule_season,
             airline_code="CM",
             status=status,
-            started_at=started_at.isoformat() if started_at else None,
-            completed_at=completed_at.isoformat() if completed_at else None,
+            started_at=started_at,
+            completed_at=completed_at,
             progress_percent=progress["percent"],
             current_phase=progress["phase"],
             messages=messages
-        )
+        ))
 
     except HTTPException:
         raise
@@ -260,82 +430,60 @@ async def get_workflow(workflow_id: str, db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{workflow_id}/progress", response_model=WorkflowProgressResponse)
-async def get_workflow_progress(workflow_id: str, db=Depends(get_db)):
+@router.get(
+    "/{workflow_id}/progress",
+    response_model=WorkflowProgressResponse,
+    deprecated=True
+)
+def get_workflow_progress(
+    workflow_id: str,
+    request: Request,
+    response: Response,
+    include_messages: bool = False,
+    db=Depends(get_db)
+):
     """
     Get real-time workflow progress
 
     Returns current execution status, progress percentage,
-    and recently completed agents.
-
-    Use this endpoint for polling or dashboard updates.
+    and recently completed agents. The last 10 agent messages are only
+    included with ?include_messages=1.
+
+    Use this endpoint for polling or dashboard updates. Responses carry an
+    ETag; pollers sending it back in If-None-Match get 304 Not Modified
+    until the status changes or another agent execution is logged.
+    Responses are cached briefly, so they may lag the database by up to
+    RUNNING_WORKFLOW_CACHE_TTL_SECONDS.
+    Deprecated: dashboards should subscribe to /{workflow_id}/progress/ws
+    or /{workflow_id}/progress/stream, which push only on changes.
     """
     try:
-        # Check scheduler first for running workflows
-        scheduler = get_scheduler(db)
-        workflow_status = scheduler.get_workflow_status(workflow_id)
+        cached = _get_cached(("progress", workflow_id, include_messages))
 
-        if workflow_status:
-            # Workflow is tracked by scheduler
-            status = workflow_status["status"]
-        else:
-            # Query database
-            cursor = db.cursor()
-            cursor.execute("""
-                SELECT status FROM schedule_workflows
-                WHERE workflow_id = %s
-            """, (workflow_id,))
-
-            row = cursor.fetchone()
-            if not row:
+        if cached is None:
+            # Status and execution log version in one round trip
+            version = _progress_version(db, workflow_id)
+            if version is None:
                 raise HTTPException(status_code=404, detail="Workflow not found")
 
-            status = row[0]
-            cursor.close()
+            # Progress only changes with the status or a new execution log entry
+            status = version[0]
+            etag = make_etag(workflow_id, include_messages, *version)
+            if is_not_modified(request, etag):
+                return not_modified(etag)
 
-        # Get messages
-        messages = _get_workflow_messages(db, workflow_id)
-
-        # Calculate progress
-        progress = _calculate_progress(status, messages)
-
-        # Determine current agent
-        current_agent = "none"
-        if messages:
-            latest = messages[-1]
-            if latest.get("status") == "completed":
-                current_agent = "supervisor"  # Between agents
-            else:
-                current_agent = latest.get("agent", "unknown")
-
-        # Get completed and pending agents
-        all_agents = [
-            "ssm_parser", "validator", "conflict_resolver",
-            "fleet_assignment", "crew_feasibility", "slot_compliance", "distribution"
-        ]
-
-        completed_agents = [
-            m["agent"] for m in messages
-            if m.get("status") == "completed" and m.get("agent") != "supervisor"
-        ]
-
-        pending_agents = [a for a in all_agents if a not in completed_agents]
+            cached = _set_cached(
+                ("progress", workflow_id, include_messages),
+                status,
+                (etag, _build_progress(db, workflow_id, status, include_messages))
+            )
 
-        # Estimate completion time
-        remaining_agents = len(pending_agents)
-        estimated_minutes = remaining_agents * 15  # 15 min per agent
+        etag, progress = cached
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        set_cache_headers(response, etag)
 
-        return WorkflowProgressResponse(
-            workflow_id=workflow_id,
-            status=status,
-            progress_percent=progress["percent"],
-            current_phase=progress["phase"],
-            current_agent=current_agent,
-            completed_agents=completed_agents,
-            pending_agents=pending_agents,
-            messages=messages[-10:],  # Last 10 messages
-            estimated_completion_minutes=estimated_minutes
-        )
+        return progress
 
     except HTTPException:
         raise
@@ -344,65 +492,112 @@ async def get_workflow_progress(workflow_id: str, db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{workflow_id}/progress/stream")
+def stream_workflow_progress(workflow_id: str, db=Depends(get_db)):
+    """
+    Stream workflow progress as Server-Sent Events
+
+    Sends the current progress, then a fresh progress event each time the
+    workflow logs an agent execution or finishes (published with Postgres
+    NOTIFY), instead of clients polling /{workflow_id}/progress. The
+    stream ends once the workflow completes, fails or is cancelled.
+
+    Consume with `new EventSource(url)`; each event's data is a
+    WorkflowProgressResponse.
+    """
+    if _get_workflow_status(db, workflow_id) is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+
+    return StreamingResponse(
+        _progress_events(workflow_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/{workflow_id}/progress/ws")
+async def workflow_progress_socket(websocket: WebSocket, workflow_id: str):
+    """
+    Push workflow progress over a WebSocket
+
+    Same updates as /{workflow_id}/progress/stream: the current progress
+    on connect, then one WorkflowProgressResponse JSON message per change.
+    The server closes the socket once the workflow finishes; unknown
+    workflows are rejected during the handshake.
+    """
+    if await asyncio.to_thread(_progress_snapshot, workflow_id) is None:
+        # 1008: policy violation, the closest close code to a 404
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+
+    async def _push():
+        async for progress in _progress_updates(workflow_id):
+            if progress is not None:
+                await websocket.send_text(progress.model_dump_json())
+
+    # Clients only ever disconnect; waiting on receive() notices that
+    # promptly and stops the push (and its LISTEN connection)
+    push = asyncio.create_task(_push())
+    disconnect = asyncio.create_task(websocket.receive())
+    done, pending = await asyncio.wait(
+        {push, disconnect}, return_when=asyncio.FIRST_COMPLETED
+    )
+
+    for task in pending:
+        task.cancel()
+
+    if push in done:
+        if push.exception() is not None:
+            logger.error(f"Workflow progress socket failed: {push.exception()}")
+        await websocket.close()
+
+
 @router.get("/{workflow_id}/summary", response_model=WorkflowSummaryResponse)
-async def get_workflow_summary(workflow_id: str, db=Depends(get_db)):
+def get_workflow_summary(workflow_id: str, db=Depends(get_db)):
     """
     Get workflow execution summary
 
     Returns high-level summary of workflow results including
     flights parsed, conflicts resolved, and validation results.
     """
-    try:
-        cursor = db.cursor()
-
-        cursor.execute("""
-            SELECT workflow_id, schedule_season, status,
-                   started_at, completed_at, output_data
-            FROM schedule_workflows
-            WHERE workflow_id = %s
-        """, (workflow_id,))
+    cached = _get_cached(("summary", workflow_id))
+    if cached is not None:
+        return cached
 
-        row = cursor.fetchone()
+    try:
+        # Counters are projected out of output_data by Postgres
+        row = _fetch_workflow_summary(db, workflow_id)
 
         if not row:
             raise HTTPException(status_code=404, detail="Workflow not found")
 
-        workflow_id, schedule_season, status, started_at, completed_at, output_data = row
-
-        # Get messages
-        messages = _get_workflow_messages(db, workflow_id)
+        (
+            workflow_id, schedule_season, status, started_at, completed_at,
+            parsed_flights, conflicts, resolutions, total_issues, critical_issues,
+            agents_executed
+        ) = row
 
         # Calculate execution time
         execution_time = 0
         if started_at and completed_at:
             execution_time = (completed_at - started_at).total_seconds()
 
-        # Get agents executed
-        agents_executed = [
-            m["agent"] for m in messages
-            if m.get("status") == "completed" and m.get("agent") != "supervisor"
-        ]
-
-        # Extract summary from output_data
-        import json
-        output = json.loads(output_data) if output_data else {}
-
-        cursor.close()
-
-        return WorkflowSummaryResponse(
+        return _set_cached(("summary", workflow_id), status, WorkflowSummaryResponse(
             workflow_id=workflow_id,
             schedule_season=schedule_season,
             status=status,
-            total_flights_parsed=output.get("parsed_flights", 0),
-            conflicts_detected=output.get("conflicts", 0),
-            conflicts_resolved=output.get("resolutions", 0),
+            total_flights_parsed=parsed_flights,
+            conflicts_detected=conflicts,
+            conflicts_resolved=resolutions,
             validation_summary={
-                "total_issues": output.get("total_issues", 0),
-                "critical_issues": output.get("critical_issues", 0)
+                "total_issues": total_issues,
+                "critical_issues": critical_issues
             },
             execution_time_seconds=execution_time,
             agents_executed=agents_executed
-        )
+        ))
 
     except HTTPException:
         raise
@@ -412,7 +607,7 @@ async def get_workflow_summary(workflow_id: str, db=Depends(get_db)):
 
 
 @router.post("/{workflow_id}/cancel")
-async def cancel_workflow(workflow_id: str, db=Depends(get_db)):
+def cancel_workflow(workflow_id: str, db=Depends(get_db)):
     """
     Cancel a running workflow
 
@@ -420,27 +615,40 @@ async def cancel_workflow(workflow_id: str, db=Depends(get_db)):
     Note: Already completed agents cannot be rolled back.
     """
     try:
-        # Update workflow status
+        # Update workflow status and wake its progress streams in one
+        # round trip; nothing is returned (or notified) unless it was running
         cursor = db.cursor()
         cursor.execute("""
-            UPDATE schedule_workflows
-            SET status = 'cancelled',
-                completed_at = NOW()
-            WHERE workflow_id = %s
-              AND status = 'running'
-        """, (workflow_id,))
-
-        rows_updated = cursor.rowcount
+            WITH cancelled AS (
+                UPDATE schedule_workflows
+                SET status = 'cancelled',
+                    completed_at = NOW()
+                WHERE workflow_id = %s
+                  AND status = 'running'
+                RETURNING started_at, completed_at
+            )
+            SELECT started_at, completed_at, pg_notify(%s, %s)
+            FROM cancelled
+        """, (workflow_id, progress_channel(workflow_id), '{"status": "cancelled"}'))
+
+        row = cursor.fetchone()
         db.commit()
         cursor.close()
 
-        if rows_updated == 0:
+        if row is None:
             raise HTTPException(
                 status_code=400,
                 detail="Workflow not found or not running"
             )
 
-        logger.info(f"Workflow {workflow_id} cancelled")
+        _invalidate_cached(workflow_id)
+
+        started_at, completed_at = row[:2]
+        logger.info(
+            f"Workflow {workflow_id} cancelled after "
+            f"{(completed_at - started_at).total_seconds():.0f}s"
+            if started_at else f"Workflow {workflow_id} cancelled"
+        )
 
         return {"workflow_id": workflow_id, "status": "cancelled"}
 
@@ -463,20 +671,12 @@ async def retry_workflow(
     Creates a new workflow with the same parameters as the failed workflow.
     """
     try:
-        # Get original workflow
-        cursor = db.cursor()
-        cursor.execute("""
-            SELECT schedule_season, status
-            FROM schedule_workflows
-            WHERE workflow_id = %s
-        """, (workflow_id,))
-
-        row = cursor.fetchone()
+        # Get original workflow (blocking query, off the event loop)
+        row = await asyncio.to_thread(_fetch_workflow, db, workflow_id)
         if not row:
             raise HTTPException(status_code=404, detail="Workflow not found")
 
-        schedule_season, status = row
-        cursor.close()
+        _, schedule_season, status = row[:3]
 
         if status != "failed":
             raise HTTPException(
@@ -485,7 +685,7 @@ async def retry_workflow(
             )
 
         # Start new workflow
-        scheduler = get_scheduler(db)
+        scheduler = get_scheduler()
         new_workflow_id = await scheduler.run_manual_update(
             season=schedule_season,
             airline_code="CM",  # TODO: Get from original workflow
@@ -511,29 +711,98 @@ async def retry_workflow(
 # Helper Functions
 # ===================================================================
 
-def _get_workflow_messages(db, workflow_id: str) -> List[Dict[str, Any]]:
-    """Get all messages for a workflow"""
+def _get_cached(key: tuple):
+    """Get a cached workflow response (None on a miss)"""
+    with _cache_lock:
+        cached = _finished_cache.get(key)
+        if cached is None:
+            cached = _running_cache.get(key)
+        return cached
+
+
+def _set_cached(key: tuple, status: str, value):
+    """Cache a workflow response for as long as its status allows"""
+    cache = _finished_cache if status in TERMINAL_WORKFLOW_STATUSES else _running_cache
+    with _cache_lock:
+        cache[key] = value
+    return value
+
+
+def _invalidate_cached(workflow_id: str):
+    """Drop cached responses after a workflow's state is changed by the API"""
+    with _cache_lock:
+        for key in (
+            ("workflow", workflow_id),
+            ("summary", workflow_id),
+            ("progress", workflow_id, False),
+            ("progress", workflow_id, True)
+        ):
+            _running_cache.pop(key, None)
+            _finished_cache.pop(key, None)
+        _list_cache.clear()
+
+
+def _execute_prepared(cursor, name: str, params: tuple):
+    """Run a PREPARED_STATEMENTS query, preparing it on first use per connection"""
+    prepared = _prepared_connections.setdefault(cursor.connection, set())
+
+    if name not in prepared:
+        cursor.execute(f"PREPARE {name} AS {PREPARED_STATEMENTS[name]}")
+        prepared.add(name)
+
+    cursor.execute(
+        f"EXECUTE {name} ({', '.join(['%s'] * len(params))})",
+        params
+    )
+
+
+def _fetch_workflow(db, workflow_id: str) -> Optional[tuple]:
+    """Get a workflow's schedule_workflows row (see wf_get)"""
+    cursor = db.cursor()
     try:
-        cursor = db.cursor()
-        cursor.execute("""
-            SELECT agent_name, status, execution_time_ms,
-                   output_summary, executed_at
-            FROM agent_executions
-            WHERE workflow_id = %s
-            ORDER BY executed_at ASC
-        """, (workflow_id,))
+        _execute_prepared(cursor, "wf_get", (workflow_id,))
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+
 
-        messages = []
-        for row in cursor.fetchall():
-            agent_name, status, exec_time_ms, output_summary, executed_at = row
+def _fetch_workflow_with_messages(db, workflow_id: str) -> Optional[tuple]:
+    """Get a workflow's row (see wf_get) followed by its messages list"""
+    cursor = db.cursor()
+    try:
+        _execute_prepared(cursor, "wf_get_with_messages", (workflow_id,))
+        return cursor.fetchone()
+    finally:
+        cursor.close()
 
-            messages.append({
+
+def _fetch_workflow_summary(db, workflow_id: str) -> Optional[tuple]:
+    """Get a workflow's summary row (see wf_summary)"""
+    cursor = db.cursor()
+    try:
+        _execute_prepared(cursor, "wf_summary", (workflow_id,))
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+def _get_recent_messages(db, workflow_id: str, limit: int) -> List[Dict[str, Any]]:
+    """Get a workflow's latest agent messages, oldest first"""
+    try:
+        cursor = db.cursor()
+        _execute_prepared(cursor, "wf_recent_messages", (workflow_id, limit))
+
+        messages = [
+            {
                 "agent": agent_name,
                 "status": status,
                 "execution_time_ms": exec_time_ms,
                 "summary": output_summary,
-                "timestamp": executed_at.isoformat() if executed_at else None
-            })
+                "timestamp": executed_at
+            }
+            for agent_name, status, exec_time_ms, output_summary, executed_at
+            in reversed(cursor.fetchall())
+        ]
 
         cursor.close()
         return messages
@@ -543,7 +812,285 @@ def _get_workflow_messages(db, workflow_id: str) -> List[Dict[str, Any]]:
         return []
 
 
-def _calculate_progress(status: str, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _progress_version(db, workflow_id: str) -> Optional[tuple]:
+    """
+    Get (status, execution count, latest execution time) of a workflow
+
+    The status comes from the scheduler for workflows it tracks, like
+    _get_workflow_status. None if the workflow does not exist.
+    """
+    cursor = db.cursor()
+    _execute_prepared(cursor, "wf_progress_version", (workflow_id,))
+
+    row = cursor.fetchone()
+    cursor.close()
+
+    workflow_status = get_scheduler().get_workflow_status(workflow_id)
+    if workflow_status:
+        # Executions reference the workflow row, so without one there are none
+        count, latest = row[1:] if row else (0, None)
+        return workflow_status["status"], count, latest
+
+    return row
+
+
+def _get_workflow_status(db, workflow_id: str) -> Optional[str]:
+    """Get a workflow's status (None if the workflow does not exist)"""
+    # Check scheduler first for running workflows
+    scheduler = get_scheduler()
+    workflow_status = scheduler.get_workflow_status(workflow_id)
+
+    if workflow_status:
+        # Workflow is tracked by scheduler
+        return workflow_status["status"]
+
+    return _fetch_workflow_status(db, workflow_id)
+
+
+def _fetch_workflow_status(db, workflow_id: str) -> Optional[str]:
+    """Get a workflow's status from its database row (None if there is none)"""
+    cursor = db.cursor()
+    _execute_prepared(cursor, "wf_status", (workflow_id,))
+
+    row = cursor.fetchone()
+    cursor.close()
+
+    return row[0] if row else None
+
+
+def _fetch_progress_counts(db, workflow_id: str) -> tuple:
+    """
+    Get (completed agents, latest agent, latest agent status) of a workflow
+
+    Aggregated in SQL so progress never loads the execution log itself.
+    """
+    cursor = db.cursor()
+    _execute_prepared(cursor, "wf_progress", (workflow_id,))
+
+    completed_agents, latest_agent, latest_status = cursor.fetchone()
+    cursor.close()
+
+    return completed_agents, latest_agent, latest_status
+
+
+def _build_progress(
+    db,
+    workflow_id: str,
+    status: str,
+    include_messages: bool = False
+) -> WorkflowProgressResponse:
+    """Build the progress report of a workflow"""
+    completed_agents, latest_agent, latest_status = _fetch_progress_counts(db, workflow_id)
+
+    # Calculate progress
+    progress = _calculate_progress(status, len(completed_agents))
+
+    # Determine current agent
+    current_agent = "none"
+    if latest_agent is not None:
+        if latest_status == "completed":
+            current_agent = "supervisor"  # Between agents
+        else:
+            current_agent = latest_agent or "unknown"
+
+    # Get pending agents
+    completed_set = set(completed_agents)
+    pending_agents = [a for a in WORKFLOW_AGENTS if a not in completed_set]
+
+    # Estimate completion time
+    remaining_agents = len(pending_agents)
+    estimated_minutes = remaining_agents * 15  # 15 min per agent
+
+    messages = []
+    if include_messages:
+        messages = _get_recent_messages(db, workflow_id, 10)  # Last 10 messages
+
+    return WorkflowProgressResponse(
+        workflow_id=workflow_id,
+        status=status,
+        progress_percent=progress["percent"],
+        current_phase=progress["phase"],
+        current_agent=current_agent,
+        completed_agents=completed_agents,
+        pending_agents=pending_agents,
+        messages=messages,
+        estimated_completion_minutes=estimated_minutes
+    )
+
+
+def _progress_snapshot(workflow_id: str) -> Optional[WorkflowProgressResponse]:
+    """Build a workflow's progress report on a pooled connection"""
+    db = get_db_connection()
+    try:
+        # Cancels and completions are written (and notified) to the row
+        # before the scheduler's in-memory entry catches up, if ever
+        status = _fetch_workflow_status(db, workflow_id)
+        if status is None:
+            # Started by the scheduler, row not recorded yet
+            workflow_status = get_scheduler().get_workflow_status(workflow_id)
+            status = workflow_status["status"] if workflow_status else None
+        if status is None:
+            return None
+        # Pushed updates keep the recent messages for live activity feeds
+        return _build_progress(db, workflow_id, status, include_messages=True)
+    finally:
+        release_db_connection(db)
+
+
+# Queued to subscribers when the shared LISTEN connection is lost
+_LISTENER_LOST = object()
+
+
+class _ProgressListener:
+    """
+    One LISTEN connection per process, shared by all progress subscribers
+
+    Notifications on a workflow's channel are fanned out to the queues of
+    that workflow's subscribers. The connection is opened by the first
+    subscriber and closed when the last one leaves, so the number of
+    listening Postgres backends no longer grows with dashboard viewers.
+    Used from the event loop thread only.
+    """
+
+    def __init__(self):
+        self._conn = None
+        self._fileno = None
+        self._subscribers: Dict[str, set] = {}
+        self._connecting = asyncio.Lock()
+
+    async def subscribe(self, workflow_id: str) -> asyncio.Queue:
+        """Listen for a workflow's progress; the caller must unsubscribe"""
+        channel = progress_channel(workflow_id)
+
+        async with self._connecting:
+            if self._conn is None:
+                self._conn = await asyncio.to_thread(open_listen_connection)
+                # Kept for remove_reader: a connection psycopg2 closed after
+                # a fatal error no longer reports its socket
+                self._fileno = self._conn.fileno()
+                asyncio.get_running_loop().add_reader(self._fileno, self._on_readable)
+
+        queue = asyncio.Queue()
+        if channel not in self._subscribers:
+            # A local round trip on an autocommit connection; run inline so
+            # the reader callback never polls the connection concurrently
+            self._execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+            self._subscribers[channel] = set()
+        self._subscribers[channel].add(queue)
+
+        return queue
+
+    def unsubscribe(self, workflow_id: str, queue: asyncio.Queue):
+        """Stop delivering to queue, closing the connection after the last"""
+        channel = progress_channel(workflow_id)
+        queues = self._subscribers.get(channel)
+        if queues is None:
+            return
+
+        queues.discard(queue)
+        if queues:
+            return
+
+        del self._subscribers[channel]
+        if self._subscribers:
+            self._execute(sql.SQL("UNLISTEN {}").format(sql.Identifier(channel)))
+        else:
+            self._close()
+
+    def _execute(self, query):
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute(query)
+        finally:
+            cursor.close()
+
+    def _on_readable(self):
+        try:
+            self._conn.poll()
+        except psycopg2.Error as e:
+            logger.error(f"Workflow progress listener lost: {e}")
+            # Streams end and clients reconnect through a fresh listener
+            for queues in self._subscribers.values():
+                for queue in queues:
+                    queue.put_nowait(_LISTENER_LOST)
+            self._subscribers.clear()
+            self._close()
+            return
+
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            for queue in self._subscribers.get(notify.channel, ()):
+                queue.put_nowait(notify.payload)
+
+    def _close(self):
+        asyncio.get_running_loop().remove_reader(self._fileno)
+        self._conn.close()
+        self._conn = None
+
+
+_progress_listener = _ProgressListener()
+
+
+async def _progress_updates(workflow_id: str):
+    """
+    Yield a workflow's progress each time it changes, until it finishes
+
+    Yields None when PROGRESS_KEEPALIVE_SECONDS pass without a change, so
+    transports can keep idle connections open.
+    """
+    # Subscribe before the first snapshot so no progress is missed
+    # between reading it and listening
+    queue = await _progress_listener.subscribe(workflow_id)
+    try:
+        while True:
+            progress = await asyncio.to_thread(_progress_snapshot, workflow_id)
+            if progress is None:
+                return
+
+            yield progress
+
+            if progress.status in TERMINAL_WORKFLOW_STATUSES:
+                return
+
+            while True:
+                try:
+                    payload = await asyncio.wait_for(
+                        queue.get(), PROGRESS_KEEPALIVE_SECONDS
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    yield None
+
+            # Payloads only signal a change; notifications that queued up
+            # meanwhile are covered by the one snapshot re-read
+            payloads = [payload]
+            while not queue.empty():
+                payloads.append(queue.get_nowait())
+            if any(p is _LISTENER_LOST for p in payloads):
+                return
+    finally:
+        _progress_listener.unsubscribe(workflow_id, queue)
+
+
+async def _progress_events(workflow_id: str):
+    """Yield SSE progress events for a workflow until it finishes"""
+    async for progress in _progress_updates(workflow_id):
+        if progress is None:
+            # Comment lines keep proxies from closing an idle stream
+            yield ": keepalive\n\n"
+        else:
+            yield f"data: {progress.model_dump_json()}\n\n"
+
+
+def _completed_agents(messages: List[Dict[str, Any]]) -> List[str]:
+    """Agents with a completed execution among loaded messages"""
+    return [
+        m["agent"] for m in messages
+        if m.get("status") == "completed" and m.get("agent") != "supervisor"
+    ]
+
+
+def _calculate_progress(status: str, completed_agents: int) -> Dict[str, Any]:
     """Calculate workflow progress percentage and phase"""
     if status == "completed":
         return {"percent": 100, "phase": "Completed"}
@@ -553,11 +1100,7 @@ def _calculate_progress(status: str, messages: List[Dict[str, Any]]) -> Dict[str
         return {"percent": 0, "phase": "Cancelled"}
 
     # Calculate based on completed agents
-    total_agents = 7
-    completed_agents = len([
-        m for m in messages
-        if m.get("status") == "completed" and m.get("agent") != "supervisor"
-    ])
+    total_agents = len(WORKFLOW_AGENTS)
 
     percent = int((completed_agents / total_agents) * 100)
 
@@ -10,6 +10,7 @@ from typing import Optional, Dict, Any
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from ...database import get_db_connection
 from .workflow import WeeklyScheduleUpdateWorkflow, ScheduleUpdateState
 
 logger = logging.getLogger(__name__)
@@ -57,8 +58,8 @@ class ScheduleWorkflowScheduler:
         logger.info("=== Starting Weekly Schedule Update ===")
 
         try:
-            # Fetch pending SSM messages
-            ssm_messages = self._fetch_pending_ssm_messages()
+            # Fetch pending SSM messages (blocking query, off the event loop)
+            ssm_messages = await asyncio.to_thread(self._fetch_pending_ssm_messages)
 
             if not ssm_messages:
                 logger.info("No pending SSM messages - skipping workflow")
@@ -143,7 +144,7 @@ class ScheduleWorkflowScheduler:
 
         # Fetch messages if not provided
         if ssm_messages is None:
-            ssm_messages = self._fetch_pending_ssm_messages()
+            ssm_messages = await asyncio.to_thread(self._fetch_pending_ssm_messages)
 
         # Create workflow
         workflow = WeeklyScheduleUpdateWorkflow(self.db, self.neo4j)
@@ -359,11 +360,18 @@ Agents Executed ({len(completed_agents)}):
 _scheduler_instance: Optional[ScheduleWorkflowScheduler] = None
 
 
-def get_scheduler(db_connection, neo4j_driver=None) -> ScheduleWorkflowScheduler:
-    """Get or create global scheduler instance"""
+def get_scheduler(db_connection=None, neo4j_driver=None) -> ScheduleWorkflowScheduler:
+    """
+    Get or create global scheduler instance
+
+    The scheduler outlives any single request, so when no connection is
+    given it checks out a dedicated one from the shared pool.
+    """
     global _scheduler_instance
 
     if _scheduler_instance is None:
+        if db_connection is None:
+            db_connection = get_db_connection()
         _scheduler_instance = ScheduleWorkflowScheduler(db_connection, neo4j_driver)
 
     return _scheduler_instance
@@ -5,11 +5,12 @@ Orchestrates all scheduling agents using LangGraph SupervisorAgent pattern
 
 from typing import TypedDict, List, Dict, Any, Annotated, Literal
 from datetime import datetime, timedelta
+import asyncio
 import operator
 import uuid
-import json
 import logging
 
+import orjson
 from langgraph.graph import StateGraph, END
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
@@ -17,6 +18,11 @@ from langchain_core.messages import HumanMessage, SystemMessage
 logger = logging.getLogger(__name__)
 
 
+def progress_channel(workflow_id: str) -> str:
+    """Postgres NOTIFY channel carrying a workflow's progress events"""
+    return f"workflow_{workflow_id}"
+
+
 class ScheduleUpdateState(TypedDict):
     """Global state for weekly schedule update workflow"""
     workflow_id: str
@@ -195,7 +201,7 @@ Current Phase: {context['current_phase']}
 Progress: {context['progress']['percent_complete']}%
 
 Recent Agent Messages (last 3):
-{json.dumps(state.get('messages', [])[-3:], indent=2) if state.get('messages') else "None"}
+{orjson.dumps(state.get('messages', [])[-3:], option=orjson.OPT_INDENT_2).decode() if state.get('messages') else "None"}
 
 Critical Issues:
 {self._format_critical_issues(state)}
@@ -218,7 +224,7 @@ Respond with JSON only:
             response = self.supervisor_llm.invoke(messages)
 
             # Parse decision
-            decision = json.loads(response.content)
+            decision = orjson.loads(response.content)
 
             state["next_agent"] = decision["next_agent"]
             state["current_agent"] = "supervisor"
@@ -705,6 +711,10 @@ Respond with JSON only:
                 )
                 VALUES (%s, %s, %s, %s, %s, NOW())
             """, (workflow_id, agent_name, status, execution_time_ms, output_summary))
+            self._notify_progress(cursor, workflow_id, {
+                "agent": agent_name,
+                "status": status
+            })
             self.db.commit()
             cursor.close()
         except Exception as e:
@@ -743,15 +753,17 @@ Respond with JSON only:
         """Execute workflow asynchronously"""
         logger.info(f"Starting async workflow {initial_state['workflow_id']}")
 
+        # Database writes block, so they run in worker threads rather than
+        # on the event loop
         try:
             # Record workflow start
-            self._record_workflow_start(initial_state)
+            await asyncio.to_thread(self._record_workflow_start, initial_state)
 
             # Execute graph
             final_state = await self.graph.ainvoke(initial_state)
 
             # Record workflow completion
-            self._record_workflow_completion(final_state)
+            await asyncio.to_thread(self._record_workflow_completion, final_state)
 
             return final_state
 
@@ -759,7 +771,7 @@ Respond with JSON only:
             logger.error(f"Async workflow execution failed: {e}", exc_info=True)
             initial_state["workflow_status"] = "failed"
             initial_state["error_message"] = str(e)
-            self._record_workflow_completion(initial_state)
+            await asyncio.to_thread(self._record_workflow_completion, initial_state)
             raise
 
     def _record_workflow_start(self, state: ScheduleUpdateState):
@@ -795,14 +807,29 @@ Respond with JSON only:
                 WHERE workflow_id = %s
             """, (
                 state.get("workflow_status", "completed"),
-                json.dumps({
+                orjson.dumps({
                     "parsed_flights": len(state.get("parsed_flights", [])),
                     "conflicts": len(state.get("conflicts", [])),
                     "resolutions": len(state.get("resolutions", []))
-                }),
+                }).decode(),
                 state["workflow_id"]
             ))
+            self._notify_progress(cursor, state["workflow_id"], {
+                "workflow_status": state.get("workflow_status", "completed")
+            })
             self.db.commit()
             cursor.close()
         except Exception as e:
             logger.error(f"Failed to record workflow completion: {e}")
+
+    def _notify_progress(self, cursor, workflow_id: str, event: Dict[str, Any]):
+        """
+        Publish a progress event to listeners of the workflow's channel
+
+        Delivered when the surrounding transaction commits, so listeners
+        never see progress that is not yet readable from the database.
+        """
+        cursor.execute(
+            "SELECT pg_notify(%s, %s)",
+            (progress_channel(workflow_id), orjson.dumps(event).decode())
+        )
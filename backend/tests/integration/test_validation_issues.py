@@ -0,0 +1,231 @@
+"""
+Integration Tests for Persisted Validation Issues
+Validates a schedule through the API and reads its issues back
+"""
+
+import os
+import orjson
+import uuid
+import pytest
+from contextlib import nullcontext
+from datetime import date
+from unittest.mock import Mock
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import validation_routes
+from app.agents.schedule_validation.validators.pattern_validator import PatternValidator
+
+
+@pytest.fixture
+def db():
+    """Database connection with a scratch schedule_validation_issues table"""
+    try:
+        conn = psycopg2.connect(os.environ["DATABASE_URL"])
+    except (KeyError, psycopg2.OperationalError):
+        pytest.skip("DATABASE_URL not set or database unavailable")
+
+    cursor = conn.cursor()
+    # Shadows the real table for this session; no schedule row needed
+    cursor.execute("""
+        CREATE TEMP TABLE schedule_validation_issues (
+            schedule_id UUID NOT NULL,
+            issue_index INTEGER NOT NULL,
+            severity VARCHAR(20) NOT NULL,
+            category VARCHAR(50) NOT NULL,
+            issue_type VARCHAR(100),
+            flight_id VARCHAR(100),
+            flight_number VARCHAR(100),
+            description TEXT,
+            recommended_action TEXT,
+            impact TEXT,
+            details JSONB NOT NULL DEFAULT '{}'::jsonb,
+            validated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+        )
+    """)
+    conn.commit()
+    cursor.close()
+
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def known_issue():
+    """Pattern issue for a flight with a malformed operating days pattern"""
+    flight = {
+        "flight_id": "test-flight-001",
+        "flight_number": "CM101",
+        "carrier_code": "CM",
+        "origin_airport": "PTY",
+        "destination_airport": "MIA",
+        "operating_days": "123",
+        "effective_from": date(2025, 1, 1),
+        "effective_to": date(2025, 3, 31)
+    }
+    issues = PatternValidator(Mock())._validate_operating_days(flight)
+    assert issues
+    return issues[0]
+
+
+@pytest.fixture
+def client(db, known_issue, monkeypatch):
+    """API client whose validation agent reports the known issue"""
+    schedule_id = str(uuid.uuid4())
+
+    agent = Mock()
+    agent.validate.return_value = {
+        "schedule_id": schedule_id,
+        "status": "warnings",
+        "summary": {"total_issues": 1},
+        "validation_results": {
+            "slot_validation": [],
+            "pattern_validation": [known_issue]
+        },
+        "validated_at": "2025-01-01T00:00:00"
+    }
+    monkeypatch.setattr(validation_routes, "_get_agent", lambda conn: nullcontext(agent))
+    monkeypatch.setattr(validation_routes, "_schedule_version", lambda conn, sid: None)
+
+    app = FastAPI()
+    app.include_router(validation_routes.router)
+    app.dependency_overrides[validation_routes.get_db] = lambda: db
+
+    return TestClient(app), schedule_id
+
+
+class TestValidationIssues:
+    """Test cases for issues persisted by /validate and read by /issues"""
+
+    def test_validate_counts_category_issues(self, client, known_issue):
+        """Test validation response counts issues from every category"""
+        api, schedule_id = client
+
+        response = api.post(
+            "/api/schedules/validation/validate",
+            json={"schedule_id": schedule_id}
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total_issues"] == 1
+        assert body[f"{known_issue['severity']}_issues"] == 1
+
+    def test_issues_returns_validated_issue(self, client, known_issue):
+        """Test /issues returns the issue found by the latest validation"""
+        api, schedule_id = client
+
+        api.post("/api/schedules/validation/validate", json={"schedule_id": schedule_id})
+        response = api.get(f"/api/schedules/validation/issues/{schedule_id}")
+
+        assert response.status_code == 200
+        issues = response.json()
+        assert len(issues) == 1
+        assert issues[0]["category"] == "pattern_validation"
+        assert issues[0]["issue_type"] == known_issue["issue_type"]
+        assert issues[0]["flight_id"] == "test-flight-001"
+
+        filtered = api.get(
+            f"/api/schedules/validation/issues/{schedule_id}",
+            params={"category": "slot_validation"}
+        )
+        assert filtered.json() == []
+
+    def test_issues_store_non_flight_label(self, client, db):
+        """Test issues labelled with a pattern instead of a flight are stored"""
+        api, schedule_id = client
+
+        routing_issue = {
+            "severity": "medium",
+            "flight_id": "test-flight-002",
+            "flight_number": "Daily pattern",
+            "issue_type": "non_circular_routing",
+            "description": "Aircraft starts at PTY but ends at MIA - non-circular routing",
+            "recommended_action": "Add return flight or plan overnight at different base",
+            "impact": "May require repositioning or overnight away from base"
+        }
+        validation_routes._store_issues(db, schedule_id, {
+            "validation_results": {"routing_validation": [routing_issue]}
+        })
+
+        response = api.get(f"/api/schedules/validation/issues/{schedule_id}")
+
+        assert response.status_code == 200
+        issues = response.json()
+        assert len(issues) == 1
+        assert issues[0]["category"] == "routing_validation"
+        assert issues[0]["flight_number"] == "Daily pattern"
+
+    def test_issues_etag_revalidation(self, client):
+        """Test /issues answers a matching If-None-Match with 304"""
+        api, schedule_id = client
+        url = f"/api/schedules/validation/issues/{schedule_id}"
+
+        api.post("/api/schedules/validation/validate", json={"schedule_id": schedule_id})
+        response = api.get(url)
+
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert etag
+
+        # Weak comparison: a proxy-weakened tag still matches
+        for tag in (etag, f"W/{etag}"):
+            cached = api.get(url, headers={"If-None-Match": tag})
+            assert cached.status_code == 304
+            assert cached.content == b""
+            assert cached.headers["ETag"] == etag
+
+    def test_issues_etag_mismatched(self, client):
+        """Test /issues sends the full response for a stale tag"""
+        api, schedule_id = client
+        url = f"/api/schedules/validation/issues/{schedule_id}"
+
+        api.post("/api/schedules/validation/validate", json={"schedule_id": schedule_id})
+        etag = api.get(url).headers["ETag"]
+
+        for tag in ('"stale"', 'W/"stale"'):
+            response = api.get(url, headers={"If-None-Match": tag})
+            assert response.status_code == 200
+            assert response.headers["ETag"] == etag
+            assert len(response.json()) == 1
+
+    def test_bulk_validate_reports_agent_error(self, client, db, monkeypatch):
+        """Test bulk validation streams an agent-reported failure as an error"""
+        api, schedule_id = client
+
+        agent = Mock()
+        agent.validate.return_value = {"error": "Schedule not found"}
+        monkeypatch.setattr(validation_routes, "_get_agent", lambda conn: nullcontext(agent))
+
+        pool = Mock()
+        pool.getconn.return_value = db
+        monkeypatch.setattr(validation_routes, "get_db_pool", lambda: pool)
+
+        response = api.post("/api/schedules/validation/bulk-validate", json=[schedule_id])
+
+        assert response.status_code == 200
+        assert orjson.loads(response.content) == {
+            "schedule_id": schedule_id,
+            "status": "error",
+            "error": "Schedule not found"
+        }
+
+
+def test_agents_are_reused_across_connections(monkeypatch):
+    """Test a borrowed agent is rebound to each connection, not rebuilt"""
+    agent_class = Mock()
+    monkeypatch.setattr(validation_routes, "ScheduleValidationAgent", agent_class)
+    monkeypatch.setattr(validation_routes, "_idle_agents", [])
+
+    first, second = Mock(), Mock()
+    with validation_routes._get_agent(first) as agent:
+        pass
+    with validation_routes._get_agent(second) as reused:
+        assert reused is agent
+        reused.use_connection.assert_called_with(second)
+
+    agent_class.assert_called_once()
+    agent.use_connection.assert_called_with(None)
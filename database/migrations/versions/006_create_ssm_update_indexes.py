@@ -0,0 +1,35 @@
+"""Create SSM update indexes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-01-17 00:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Apply migration: Create SSM update indexes"""
+
+    # Read and execute the SQL schema file
+    with open('../schemas/006_ssm_update_indexes.sql', 'r') as f:
+        sql_commands = f.read()
+
+    # Execute the SQL
+    op.execute(sql_commands)
+
+
+def downgrade() -> None:
+    """Revert migration: Drop SSM update indexes"""
+
+    op.execute("DROP INDEX IF EXISTS idx_flights_ssm_match")
@@ -0,0 +1,35 @@
+"""Create schedule validation issues table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-01-17 00:06:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Apply migration: Create schedule validation issues table"""
+
+    # Read and execute the SQL schema file
+    with open('../schemas/007_schedule_validation_issues.sql', 'r') as f:
+        sql_commands = f.read()
+
+    # Execute the SQL
+    op.execute(sql_commands)
+
+
+def downgrade() -> None:
+    """Revert migration: Drop schedule validation issues table"""
+
+    op.execute("DROP TABLE IF EXISTS schedule_validation_issues CASCADE")
@@ -0,0 +1,37 @@
+"""Create SSM statistics view
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-01-17 00:07:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Apply migration: Create SSM statistics view"""
+
+    # Read and execute the SQL schema file
+    with open('../schemas/008_ssm_statistics_view.sql', 'r') as f:
+        sql_commands = f.read()
+
+    # Execute the SQL
+    op.execute(sql_commands)
+
+
+def downgrade() -> None:
+    """Revert migration: Drop SSM statistics view"""
+
+    # Dropping the view drops its unique index
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS ssm_stats_24h")
+    op.execute("DROP INDEX IF EXISTS idx_ssm_received_stats")
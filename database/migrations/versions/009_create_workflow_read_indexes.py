@@ -0,0 +1,44 @@
+"""Create workflow read indexes
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-01-17 00:08:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Apply migration: Create workflow read indexes"""
+
+    # Read and execute the SQL schema file
+    with open('../schemas/009_workflow_read_indexes.sql', 'r') as f:
+        sql_commands = f.read()
+
+    # Execute the SQL
+    op.execute(sql_commands)
+
+
+def downgrade() -> None:
+    """Revert migration: Drop workflow read indexes and workflow columns"""
+
+    # Drop indexes
+    op.execute("DROP INDEX IF EXISTS idx_wf_type_started")
+    op.execute("DROP INDEX IF EXISTS idx_wf_status_started")
+    op.execute("DROP INDEX IF EXISTS idx_agent_exec_wf_time")
+
+    # Drop columns written by the schedule update workflow
+    op.execute("ALTER TABLE agent_executions DROP COLUMN IF EXISTS executed_at")
+    op.execute("ALTER TABLE agent_executions DROP COLUMN IF EXISTS output_summary")
+    op.execute("ALTER TABLE schedule_workflows DROP COLUMN IF EXISTS output_data")
+    op.execute("ALTER TABLE schedule_workflows DROP COLUMN IF EXISTS schedule_season")
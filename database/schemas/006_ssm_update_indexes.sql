@@ -0,0 +1,13 @@
+-- =====================================================
+-- Airline Schedule Management System
+-- SSM Update Indexes
+-- =====================================================
+-- Purpose: Indexes for the SSM writer's flight lookups
+--          (TIM/EQT/CNL updates)
+-- =====================================================
+
+-- Covers the flight match used by SSM updates: equality on the flight key,
+-- effective date range and flight_id answered from the index alone
+CREATE INDEX IF NOT EXISTS idx_flights_ssm_match ON flights(
+    carrier_code, flight_number, origin_airport, destination_airport, operating_days
+) INCLUDE (flight_id, effective_from, effective_to);
@@ -0,0 +1,48 @@
+-- =====================================================
+-- Airline Schedule Management System
+-- Schedule Validation Issues
+-- =====================================================
+-- Purpose: Issues from the latest validation run of each
+--          schedule, queried by the validation API
+-- =====================================================
+
+-- -----------------------------------------------------
+-- schedule_validation_issues: Latest validation issues
+-- -----------------------------------------------------
+-- Description: One row per issue found by the
+-- ScheduleValidationAgent. Each run replaces the
+-- schedule's previous issues.
+-- -----------------------------------------------------
+CREATE TABLE IF NOT EXISTS schedule_validation_issues (
+    issue_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    schedule_id UUID NOT NULL REFERENCES schedules(schedule_id) ON DELETE CASCADE,
+
+    -- Position in the agent's issue list (API ordering)
+    issue_index INTEGER NOT NULL,
+
+    -- Issue classification
+    severity VARCHAR(20) NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    issue_type VARCHAR(100),
+
+    -- Affected flight
+    flight_id VARCHAR(100),
+    flight_number VARCHAR(100),
+
+    -- Issue details
+    description TEXT,
+    recommended_action TEXT,
+    impact TEXT,
+    details JSONB NOT NULL DEFAULT '{}'::jsonb,
+
+    validated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE schedule_validation_issues IS 'Issues from the latest validation run of each schedule';
+COMMENT ON COLUMN schedule_validation_issues.details IS 'Full issue as reported by the validator';
+
+-- Serves the issues endpoint: schedule, optional severity/category filters,
+-- paginated in issue order
+CREATE INDEX IF NOT EXISTS idx_validation_issues_lookup ON schedule_validation_issues(
+    schedule_id, severity, category, issue_index
+);
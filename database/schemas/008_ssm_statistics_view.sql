@@ -0,0 +1,50 @@
+-- =====================================================
+-- Airline Schedule Management System
+-- SSM Statistics View
+-- =====================================================
+-- Purpose: Precomputed 24-hour SSM processing statistics
+--          for the /api/schedules/ssm/statistics endpoint
+-- =====================================================
+
+-- Covers the statistics scan: the 24-hour window on received_at with the
+-- aggregated columns answered from the index alone
+CREATE INDEX IF NOT EXISTS idx_ssm_received_stats ON ssm_messages(received_at)
+    INCLUDE (processing_status, message_type, processed_at);
+
+-- -----------------------------------------------------
+-- ssm_stats_24h: SSM statistics for the last 24 hours
+-- -----------------------------------------------------
+-- Description: One row, recomputed by
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY ssm_stats_24h
+-- (the API refreshes it once it is a minute old)
+-- -----------------------------------------------------
+CREATE MATERIALIZED VIEW IF NOT EXISTS ssm_stats_24h AS
+WITH recent AS (
+    SELECT message_type, processing_status, received_at, processed_at
+    FROM ssm_messages
+    WHERE received_at >= NOW() - INTERVAL '24 hours'
+)
+SELECT
+    NOW() AS refreshed_at,
+    COUNT(*) AS total_messages,
+    COUNT(*) FILTER (WHERE processing_status = 'completed') AS successful,
+    COUNT(*) FILTER (WHERE processing_status = 'failed') AS failed,
+    COUNT(*) FILTER (WHERE processing_status = 'rejected') AS rejected,
+    AVG(EXTRACT(EPOCH FROM (processed_at - received_at)) * 1000)::INT AS avg_processing_ms,
+    COALESCE(
+        (
+            SELECT json_object_agg(message_type, count ORDER BY count DESC)
+            FROM (
+                SELECT message_type, COUNT(*) AS count
+                FROM recent
+                GROUP BY message_type
+            ) AS type_counts
+        ),
+        '{}'::json
+    ) AS message_type_distribution
+FROM recent;
+
+COMMENT ON MATERIALIZED VIEW ssm_stats_24h IS 'SSM processing statistics for the 24 hours before refreshed_at';
+
+-- REFRESH ... CONCURRENTLY requires a unique index
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ssm_stats_24h_refreshed ON ssm_stats_24h(refreshed_at);
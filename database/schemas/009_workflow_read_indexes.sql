@@ -0,0 +1,28 @@
+-- =====================================================
+-- Airline Schedule Management System
+-- Workflow Read Indexes
+-- =====================================================
+-- Purpose: Index-ordered reads for the workflow API
+--          (/api/schedules/workflows list, detail and progress)
+-- =====================================================
+
+-- Columns written by the schedule update workflow
+ALTER TABLE schedule_workflows ADD COLUMN IF NOT EXISTS schedule_season VARCHAR(10);
+ALTER TABLE schedule_workflows ADD COLUMN IF NOT EXISTS output_data JSONB;
+ALTER TABLE agent_executions ADD COLUMN IF NOT EXISTS output_summary TEXT;
+ALTER TABLE agent_executions ADD COLUMN IF NOT EXISTS executed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
+-- Execution log of one workflow in executed_at order (messages, progress)
+-- read as an index range scan instead of a sort
+CREATE INDEX IF NOT EXISTS idx_agent_exec_wf_time ON agent_executions(workflow_id, executed_at);
+
+-- Covers the workflow list: type and status filters, newest first, with
+-- the listed columns answered from the index
+CREATE INDEX IF NOT EXISTS idx_wf_status_started ON schedule_workflows(
+    workflow_type, status, started_at DESC
+) INCLUDE (workflow_id, schedule_season, completed_at);
+
+-- Same list without a status filter (the dashboard default)
+CREATE INDEX IF NOT EXISTS idx_wf_type_started ON schedule_workflows(
+    workflow_type, started_at DESC
+) INCLUDE (workflow_id, schedule_season, status, completed_at);
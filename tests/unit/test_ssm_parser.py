@@ -4,8 +4,12 @@ Tests SSM message parsing logic
 """
 
 import pytest
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from unittest.mock import MagicMock
 from backend.app.agents.ssm_parser.parsers.ssm_parser import SSMParser
+from backend.app.agents.ssm_parser.parsers.ssim_parser import SSIMParser
+from backend.app.agents.ssm_parser.agent import SSMParserAgent, ParsedSSM
 
 
 class TestSSMParser:
@@ -101,6 +105,14 @@ class TestSSMParser:
         days = self.parser._parse_operating_days("X2X4X6X")
         assert days == [2, 4, 6]
 
+    def test_operating_days_mask(self):
+        """Test operating days bitmask in parsed data"""
+        message = "CNL CM 0100 PTY MIA X2X4X6X 15JAN25 20JAN25"
+        result = self.parser.parse(message, "CNL")
+
+        assert result["operating_days_mask"] == 0b0101010
+        assert result["operating_days_array"] == [2, 4, 6]
+
     def test_parse_ssm_date(self):
         """Test SSM date parsing"""
         date = self.parser._parse_ssm_date("1DEC24")
@@ -149,6 +161,21 @@ class TestSSMParser:
         assert results[0]["flight_number"] == "0100"
         assert results[1]["flight_number"] == "0102"
 
+    def test_parse_batch_in_process_pool(self):
+        """Test batch parsing in worker processes"""
+        lines = [
+            "NEW CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 738 0715 0945",
+            "not an SSM line",
+            "CNL CM 0100 PTY MIA 1234567 15JAN25",
+        ]
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = self.parser.parse_batch(lines, executor, chunksize=1)
+
+        assert results == self.parser.parse_batch(lines)
+        assert len(results) == 2
+        assert results[0]["flight_number"] == "0100"
+        assert "error" in results[1]
+
     def test_confidence_score(self):
         """Test confidence score for regex parsing"""
         message = "NEW CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 738 0715 0945"
@@ -157,5 +184,159 @@ class TestSSMParser:
         assert result["confidence"] == 1.0
 
 
+class TestLLMAssistedParse:
+    """Test LLM fallback parsing with a stubbed structured-output model"""
+
+    def setup_method(self):
+        """Setup agent whose LLM returns a canned ParsedSSM"""
+        self.agent = SSMParserAgent(MagicMock(), MagicMock(), validator=MagicMock())
+        self.agent.llm = MagicMock()
+
+    def _parse(self, parsed: ParsedSSM):
+        self.agent.llm.with_structured_output.return_value.invoke.return_value = {
+            "parsed": parsed,
+            "raw": MagicMock(usage_metadata={"total_tokens": 42}),
+            "parsing_error": None
+        }
+        return self.agent._llm_assisted_parse("unparseable by regex")
+
+    def test_llm_parse_new_message(self):
+        """Test NEW message with times gets day offset"""
+        result = self._parse(ParsedSSM(
+            message_type="NEW", airline="CM", flight_number="0100",
+            origin="PTY", destination="MIA", operating_days="1234567",
+            effective_from="1DEC24", effective_to="31MAR25",
+            aircraft_type="738", departure_time="2200", arrival_time="0130",
+            confidence=0.8
+        ))
+
+        assert result["flight_number"] == "0100"
+        assert result["arrival_day_offset"] == 1
+        assert result["effective_from_date"] == datetime(2024, 12, 1)
+        assert result["confidence"] == 0.8
+        assert result["tokens_used"] == 42
+
+    def test_llm_parse_cnl_message(self):
+        """Test CNL message without times parses instead of failing"""
+        result = self._parse(ParsedSSM(
+            message_type="CNL", airline="CM", flight_number="0100",
+            origin="PTY", destination="MIA", operating_days="1234567",
+            effective_from="15JAN25", effective_to="20JAN25",
+            confidence=0.9
+        ))
+
+        assert result["flight_number"] == "0100"
+        assert "departure_time" not in result
+        assert "arrival_day_offset" not in result
+        assert result["operating_days_array"] == [1, 2, 3, 4, 5, 6, 7]
+
+
+class TestParallelBatchParse:
+    """Test large batches are pre-parsed in worker processes"""
+
+    def setup_method(self):
+        """Setup agent with stubbed collaborators"""
+        self.agent = SSMParserAgent(
+            MagicMock(), MagicMock(), use_llm_fallback=False, validator=MagicMock()
+        )
+
+    def test_process_batch_hands_parses_to_every_message(self):
+        """Test every message of a large batch gets its pre-parsed result"""
+        messages = [
+            f"NEW CM {n:04d} J PTY MIA 1234567 1DEC24 31MAR25 738 0715 0945"
+            for n in range(300)
+        ]
+        self.agent.process = MagicMock(return_value={"status": "completed"})
+
+        result = self.agent.process_batch(messages, batch_size=50, max_workers=2)
+
+        assert result["successful"] == 300
+        for message, call in zip(messages, self.agent.process.call_args_list):
+            node, parsed_data = call.kwargs["primed_parse"]
+            assert node == "parse_ssm"
+            assert parsed_data["flight_number"] == message.split()[2]
+
+    def test_parse_node_uses_primed_result(self):
+        """Test the parse node skips parsing when handed a primed result"""
+        self.agent.ssm_parser = MagicMock()
+        parsed_data = {"flight_number": "0100", "confidence": 1.0}
+
+        state = self.agent.parse_ssm_message({
+            "raw_message": "NEW CM 0100 J PTY MIA 1234567 1DEC24 31MAR25 738 0715 0945",
+            "message_type": "NEW",
+            "primed_parse": ("parse_ssm", parsed_data),
+            "validation_errors": []
+        })
+
+        assert state["parsed_data"] is parsed_data
+        self.agent.ssm_parser.parse.assert_not_called()
+
+
+class TestPooledAgent:
+    """Test an agent bound to a connection pool instead of a connection"""
+
+    def test_process_by_id_reads_through_pool(self):
+        """Test the stored message is read on a pooled connection and returned"""
+        pool = MagicMock()
+        conn = pool.getconn.return_value
+        conn.cursor.return_value.fetchone.return_value = None
+        agent = SSMParserAgent(None, MagicMock(), db_pool=pool, validator=MagicMock())
+
+        assert agent.process_by_id("missing") is None
+        pool.putconn.assert_called_once_with(conn)
+
+
+# Three flights as read from a file: a two-leg flight (Type 3 + Type 4),
+# one from an unknown carrier and a single-leg flight
+SSIM_STREAM = [
+    "3 CM 0100JPTYMIA1234567 01DEC2431MAR26738 0715 0945 0230 E0 M JP\n",
+    "4 CM 0100MIAJFK 738 1100 1400\n",
+    "3 ZZ 0200JPTYMIA1234567 01DEC2431MAR26738 0715 0945\n",
+    "3 CM 0300JPTYBOG1234567 01DEC2431MAR26738 0800 0930\n",
+]
+
+
+class TestSSIMStreaming:
+    """Test streamed SSIM parsing and loading"""
+
+    def test_iter_flights_groups_continuation_legs(self):
+        """Test Type 4 records attach to the preceding Type 3 flight"""
+        flights = list(SSIMParser().iter_flights(iter(SSIM_STREAM)))
+
+        assert [f["flight_number"] for f in flights] == ["0100", "0200", "0300"]
+        assert flights[0]["total_legs"] == 2
+        assert flights[0]["continuation_legs"][0]["destination"] == "JFK"
+        assert not flights[2]["is_multi_leg"]
+
+    def test_iter_flights_rejects_orphan_continuation(self):
+        """Test a Type 4 record before any Type 3 record"""
+        with pytest.raises(ValueError):
+            list(SSIMParser().iter_flights(["4 CM 0100MIAJFK 738 1100 1400"]))
+
+    def test_process_ssim_stream_counts_and_copies(self):
+        """Test invalid flights are counted and skipped, valid ones copied"""
+        agent = SSMParserAgent(MagicMock(), MagicMock(), use_llm_fallback=False)
+        copied = []
+        agent.db_writer.copy_stream = MagicMock(
+            side_effect=lambda records, chunk_size: copied.extend(records) or ["id-1", "id-2"]
+        )
+
+        result = agent.process_ssim_stream(iter(SSIM_STREAM))
+
+        assert result["status"] == "completed"
+        assert result["total"] == 3
+        assert result["successful"] == 2
+        assert result["rejected"] == 1
+        assert result["affected_flight_ids"] == ["id-1", "id-2"]
+
+        assert [(r["record_type"], r.get("flight_number")) for r in copied] == [
+            ("flight", "CM0100"),
+            ("flight_leg", None),
+            ("flight", "CM0300"),
+        ]
+        assert copied[1]["departure_airport"] == "MIA"
+        assert copied[1]["arrival_airport"] == "JFK"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])